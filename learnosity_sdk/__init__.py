@@ -1,10 +1,26 @@
-import learnosity_sdk.request
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 import learnosity_sdk.exceptions
-import learnosity_sdk.utils
 from learnosity_sdk._version import __version__
 
+if TYPE_CHECKING:
+    import learnosity_sdk.request
+    import learnosity_sdk.utils
+
 __all__ = [
         "exceptions",
         "request",
         "utils",
         ]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the subpackages on first use
+    if name in ("request", "utils"):
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,73 @@
-from .init import Init
-from .dataapi import DataApi
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+from .init import Init, ValidatedSecurity
+from .signer import SignatureCache, Signer, UserHashCache
+from .template import ActivityTemplate, Placeholder, PreparedRequest, RequestTemplate
+
+if TYPE_CHECKING:
+    from .dataapi import DataApi
+    from .async_dataapi import AsyncDataApi
+    from .bulk import BatchResult, BulkWriter
+    from .cache import DiskCache, MemoryCache, ResponseCache
+    from .checkpoint import (
+            Checkpoint, CheckpointStore, FileCheckpointStore, SqliteCheckpointStore)
+    from .loader import DataLoader
+    from .ratelimit import RateLimitController
+
+# Imported on first use, so that signing alone does not import requests
+_lazy = {
+        "AsyncDataApi": ".async_dataapi",
+        "BatchResult": ".bulk",
+        "BulkWriter": ".bulk",
+        "Checkpoint": ".checkpoint",
+        "CheckpointStore": ".checkpoint",
+        "DataApi": ".dataapi",
+        "DataLoader": ".loader",
+        "DiskCache": ".cache",
+        "FileCheckpointStore": ".checkpoint",
+        "MemoryCache": ".cache",
+        "RateLimitController": ".ratelimit",
+        "ResponseCache": ".cache",
+        "SqliteCheckpointStore": ".checkpoint",
+        }
 
 __all__ = [
+        "ActivityTemplate",
+        "AsyncDataApi",
+        "BatchResult",
+        "BulkWriter",
+        "Checkpoint",
+        "CheckpointStore",
         "DataApi",
+        "DataLoader",
+        "DiskCache",
+        "FileCheckpointStore",
         "Init",
+        "MemoryCache",
+        "Placeholder",
+        "PreparedRequest",
+        "RateLimitController",
+        "RequestTemplate",
+        "ResponseCache",
+        "SignatureCache",
+        "Signer",
+        "SqliteCheckpointStore",
+        "UserHashCache",
+        "ValidatedSecurity",
         ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy:
+        value = getattr(importlib.import_module(_lazy[name], __name__), name)
+        globals()[name] = value
+        return value
+    # The modules themselves, as when they were imported eagerly
+    if '.' + name in _lazy.values():
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_lazy))
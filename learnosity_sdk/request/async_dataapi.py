@@ -0,0 +1,187 @@
+import asyncio
+import copy
+from types import TracebackType
+from typing import Any, AsyncGenerator, Dict, Optional, Type, Union, cast
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:  # pragma: no cover
+    HAS_HTTPX = False
+
+from learnosity_sdk.request.dataapi import DataApi
+from learnosity_sdk.request.init import Init
+from learnosity_sdk.request.signer import Signer
+
+
+class AsyncDataApi(object):
+    """
+    Asyncio client for Data API
+
+    This provides the same `request`, `request_iter` and `results_iter`
+    methods as `DataApi`, as a coroutine and async generators.
+
+    Requests are sent with an `httpx.AsyncClient`, so they are awaited on
+    the event loop rather than run on threads. Up to `max_concurrency`
+    requests can be in flight at once; further requests wait until a slot
+    frees up.
+
+    httpx is an optional dependency, installed with
+    `pip install learnosity_sdk[async]`. The caching, coalescing and rate
+    limiting options of `DataApi` are not supported.
+    """
+
+    def __init__(self, max_concurrency: int = 100,
+                 client: Optional['httpx.AsyncClient'] = None,
+                 timeout: Optional[float] = None) -> None:
+        """
+        Args:
+            max_concurrency (int): The maximum number of requests in flight
+            client (httpx.AsyncClient): The client used to send requests. If
+                given, it is not closed by `close`. By default, a client
+                with a connection pool of `max_concurrency` connections is
+                created.
+            timeout (float): The timeout of the default client, in seconds.
+                By default, as for `DataApi`, requests do not time out.
+
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if not HAS_HTTPX:
+            raise ImportError(
+                'AsyncDataApi requires httpx: pip install learnosity_sdk[async]')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        self.max_concurrency = max_concurrency
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency,
+                                max_keepalive_connections=max_concurrency),
+            timeout=timeout)
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncDataApi':
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]],
+                        exc_value: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying client and its pooled connections
+
+        A client passed in by the caller is left open.
+        """
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily, as before Python 3.10 a semaphore is bound to the
+        # event loop that is current when it is created.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def request(self, endpoint: str, security_packet: Dict[str, str],
+                      secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                      action: str = 'get') -> 'httpx.Response':
+        """
+        Make a request to Data API
+
+        See `DataApi.request`.
+
+        Args:
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            request_packet (dict): The request parameters
+            action (string): 'get', 'set', 'update', etc.
+
+        Returns:
+            httpx.Response: The response object
+        """
+        async with self._get_semaphore():
+            init = Init('data', security_packet, secret, request_packet, action)
+            # Data API requests are always form fields
+            data = cast(Dict[str, Any], init.generate(False))
+            return await self.client.post(
+                endpoint, data=data,
+                headers=DataApi._headers(endpoint, security_packet, action))
+
+    async def results_iter(self, endpoint: str, security_packet: Dict[str, str],
+                           secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                           action: str = 'get') -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Return an async iterator of all results from a request to Data API
+
+        See `DataApi.results_iter`.
+
+        Args:
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            request_packet (dict): The request parameters
+            action (string): 'get', 'set', 'update', etc.
+
+        Yields:
+            dict: An individual result (item, question, etc.) from the server
+
+        Raises:
+            DataApiException: Raised if there was a problem fetching
+            data or if the server returns an invalid response.
+        """
+        async for response in self.request_iter(endpoint, security_packet,
+                                                secret, request_packet,
+                                                action):
+            for result in DataApi._page_results(response):
+                yield result
+
+    async def request_iter(self, endpoint: str, security_packet: Dict[str, str],
+                           secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                           action: str = 'get') -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Iterate asynchronously over the pages of results of a query to data api
+
+        See `DataApi.request_iter`.
+
+        Args:
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            request_packet (dict): The request parameters
+            action (string): 'get', 'set', 'update', etc.
+
+        Yields:
+            dict: The response from the server
+
+        Raises:
+            DataApiException: Raised if there was a problem fetching
+            data or if the server returns an invalid response.
+        """
+        # just in case the security_packet or request_packet
+        # are modified between yields
+        security_packet = copy.deepcopy(security_packet)
+        request_packet = copy.deepcopy(request_packet)
+
+        data_end = False
+
+        while not data_end:
+            res = await self.request(
+                endpoint,
+                security_packet,
+                secret,
+                request_packet,
+                action
+            )
+            data = DataApi._parse_page(res)
+
+            if DataApi._has_next_page(data):
+                request_packet['next'] = data['meta']['next']
+            else:
+                data_end = True
+
+            yield data
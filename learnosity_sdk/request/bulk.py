@@ -0,0 +1,144 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests import Response
+
+from learnosity_sdk.exceptions import DataApiException
+from learnosity_sdk.request.dataapi import DataApi
+from learnosity_sdk.request.signer import Signer
+from learnosity_sdk.utils.executor import bounded_map
+
+
+class BatchResult(NamedTuple):
+    """
+    The outcome of writing one batch of records to Data API
+    """
+
+    # The position of the batch in the sequence of batches
+    batch_index: int
+    records: List[Dict[str, Any]]
+    # None if the request could not be sent
+    response: Optional[Response]
+    # None if the batch was written successfully
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BulkWriter(object):
+    """
+    Write a large number of records to a Data API set/update endpoint
+
+    Records are packed into batches of at most `max_batch_records` records
+    and `max_batch_bytes` bytes of encoded JSON (a single record larger than
+    this is sent on its own). Each batch is signed and sent as one request
+    under `records_key`, with up to `max_in_flight` requests in flight.
+
+    Failed batches do not stop the others: the outcome of every batch is
+    reported as a `BatchResult`.
+    """
+
+    def __init__(self, client: DataApi, endpoint: str,
+                 security_packet: Dict[str, str], secret: Union[str, Signer],
+                 action: str = 'set', records_key: Optional[str] = None,
+                 request_packet: Dict[str, Any] = {},
+                 max_batch_records: int = 50,
+                 max_batch_bytes: int = 2000000,
+                 max_in_flight: int = 4) -> None:
+        """
+        Args:
+            client (DataApi): The client used to send requests
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            action (string): 'set', 'update', etc.
+            records_key (string): The request parameter holding the records.
+                Defaults to the last segment of the endpoint path, e.g.
+                'items' for '/itembank/items'.
+            request_packet (dict): Additional request parameters sent with
+                every batch
+            max_batch_records (int): The maximum number of records per batch
+            max_batch_bytes (int): The maximum encoded size of the records of
+                a batch
+            max_in_flight (int): The maximum number of batches in flight
+        """
+        if max_batch_records < 1:
+            raise ValueError('max_batch_records must be at least 1')
+
+        self.client = client
+        self.endpoint = endpoint
+        self.security_packet = security_packet
+        self.secret = secret
+        self.action = action
+        if records_key is None:
+            records_key = client._endpoint_path(endpoint).rsplit('/', 1)[-1]
+        self.records_key = records_key
+        self.request_packet = request_packet
+        self.max_batch_records = max_batch_records
+        self.max_batch_bytes = max_batch_bytes
+        self.max_in_flight = max_in_flight
+
+    def batches(self, records: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Pack records into batches bounded in count and encoded size
+
+        Args:
+            records (iterable): The records to pack
+
+        Yields:
+            list: A batch of records
+        """
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+
+        for record in records:
+            # Separators match the request string signed by Init, plus one
+            # byte for the comma between records
+            record_bytes = len(json.dumps(
+                record, separators=(',', ':'), ensure_ascii=False
+            ).encode('utf-8')) + 1
+
+            if batch and (len(batch) >= self.max_batch_records
+                          or batch_bytes + record_bytes > self.max_batch_bytes):
+                yield batch
+                batch = []
+                batch_bytes = 0
+
+            batch.append(record)
+            batch_bytes += record_bytes
+
+        if batch:
+            yield batch
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> Iterator[BatchResult]:
+        """
+        Write records in concurrent batches
+
+        `records` is consumed lazily, as batches complete.
+
+        Args:
+            records (iterable): The records to write
+
+        Yields:
+            BatchResult: The outcome of each batch, in completion order
+        """
+        return bounded_map(self._send, enumerate(self.batches(records)),
+                           self.max_in_flight)
+
+    def _send(self, batch: Tuple[int, List[Dict[str, Any]]]) -> BatchResult:
+        batch_index, records = batch
+        request_packet = dict(self.request_packet)
+        request_packet[self.records_key] = records
+
+        res = None
+        try:
+            res = self.client.request(self.endpoint, self.security_packet,
+                                      self.secret, request_packet, self.action)
+            DataApi._parse_page(res)
+        except (DataApiException, requests.RequestException) as e:
+            return BatchResult(batch_index, records, res, e)
+
+        return BatchResult(batch_index, records, res, None)
@@ -0,0 +1,177 @@
+import abc
+import collections
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Callable, Optional, OrderedDict, Tuple
+
+
+class ResponseCache(abc.ABC):
+    """
+    Base class for caches of Data API responses
+
+    A cache maps keys to opaque byte strings. Entries expire `ttl` seconds
+    after they were set (never, if `ttl` is None), and the least recently
+    used entries are evicted to keep at most `maxsize` entries.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        "Return the value cached for a key, if any and not expired"
+
+    @abc.abstractmethod
+    def set(self, key: str, value: bytes) -> None:
+        "Cache a value, replacing any previous value for the key"
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        "Remove all entries"
+
+
+class MemoryCache(ResponseCache):
+    """
+    Cache responses in memory, in the current process
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__(maxsize, ttl)
+        self.clock = clock
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        expires = float('inf') if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(ResponseCache):
+    """
+    Cache responses as files in a local directory
+
+    Entries persist across processes and can be shared by processes using
+    the same directory. The modification time of each file records when it
+    was last used, for LRU eviction. When there are more than `maxsize`
+    entries, the least recently used are removed until there are 90% of
+    `maxsize` left, so that the directory is scanned once per batch of new
+    entries rather than for each one.
+
+    The directory must only be writable by trusted users.
+    """
+
+    _SUFFIX = '.cache'
+    _HEADER = struct.Struct('<d')
+
+    def __init__(self, directory: str, maxsize: int = 10000,
+                 ttl: Optional[float] = 300) -> None:
+        super().__init__(maxsize, ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._count = len(self._files())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self._SUFFIX)
+
+    def _files(self) -> Tuple[str, ...]:
+        return tuple(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(self._SUFFIX))
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) < self._HEADER.size:
+            return None
+        expires, = self._HEADER.unpack_from(data)
+        if expires < time.time():
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data[self._HEADER.size:]
+
+    def set(self, key: str, value: bytes) -> None:
+        expires = float('inf') if self.ttl is None else time.time() + self.ttl
+        path = self._path(key)
+        is_new = not os.path.exists(path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._HEADER.pack(expires))
+                f.write(value)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            if is_new:
+                self._count += 1
+            if self._count > self.maxsize:
+                self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._files():
+                self._remove(path)
+            self._count = 0
+
+    def _evict(self) -> None:
+        files = []
+        for path in self._files():
+            try:
+                files.append((os.stat(path).st_mtime, path))
+            except FileNotFoundError:
+                pass
+        files.sort()
+        # Down to a low-water mark, as each eviction lists the directory
+        keep = self.maxsize - self.maxsize // 10
+        for _, path in files[:max(0, len(files) - keep)]:
+            self._remove(path)
+        self._count = min(len(files), keep)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,138 @@
+import abc
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+
+class Checkpoint(NamedTuple):
+    """
+    The progress of a paginated Data API query
+    """
+
+    # The `meta.next` cursor of the last acknowledged page, or None
+    next: Optional[str]
+    # The number of results in the acknowledged pages
+    result_count: int
+    # Whether the last page has been acknowledged
+    complete: bool = False
+
+
+class CheckpointStore(abc.ABC):
+    """
+    Base class for stores of pagination checkpoints, keyed by query
+    """
+
+    @abc.abstractmethod
+    def load(self, key: str) -> Optional[Checkpoint]:
+        "Return the checkpoint saved for a query, if any"
+
+    @abc.abstractmethod
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        "Save the checkpoint of a query, replacing any previous one"
+
+    @abc.abstractmethod
+    def clear(self, key: str) -> None:
+        "Remove the checkpoint of a query"
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Store checkpoints in a local JSON file
+
+    The file is rewritten atomically on each save, so a crash never leaves a
+    partially written checkpoint behind.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                checkpoints: Dict[str, Dict[str, Any]] = json.load(f)
+                return checkpoints
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, checkpoints: Dict[str, Dict[str, Any]]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(checkpoints, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        with self._lock:
+            checkpoint = self._read().get(key)
+        if checkpoint is None:
+            return None
+        return Checkpoint(checkpoint['next'], checkpoint['result_count'],
+                          checkpoint['complete'])
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[key] = dict(checkpoint._asdict())
+            self._write(checkpoints)
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(key, None) is not None:
+                self._write(checkpoints)
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """
+    Store checkpoints in a local SQLite database
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        with self._transaction() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS checkpoints ('
+                ' key TEXT PRIMARY KEY,'
+                ' next TEXT,'
+                ' result_count INTEGER NOT NULL,'
+                ' complete INTEGER NOT NULL)')
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation, so the store can be shared by threads
+        with self._lock, contextlib.closing(
+                sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                yield connection
+
+    def load(self, key: str) -> Optional[Checkpoint]:
+        with self._transaction() as connection:
+            row = connection.execute(
+                'SELECT next, result_count, complete FROM checkpoints WHERE key = ?',
+                (key,)).fetchone()
+        if row is None:
+            return None
+        return Checkpoint(row[0], row[1], bool(row[2]))
+
+    def save(self, key: str, checkpoint: Checkpoint) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO checkpoints (key, next, result_count, complete)'
+                ' VALUES (?, ?, ?, ?)',
+                (key, checkpoint.next, checkpoint.result_count, int(checkpoint.complete)))
+
+    def clear(self, key: str) -> None:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM checkpoints WHERE key = ?', (key,))
@@ -1,18 +1,183 @@
-from typing import Any, Dict, Generator
+from types import TracebackType
+from typing import Any, Dict, Generator, Iterator, List, Optional, Protocol, Tuple, Type, Union
 from requests import Response
+from requests.adapters import HTTPAdapter
 import requests
 import copy
+import hashlib
+import hmac
+import json
+import marshal
+import os
 import re
 from urllib.parse import urlparse
 
 from learnosity_sdk.exceptions import DataApiException
 from learnosity_sdk.request import Init
+from learnosity_sdk.request.cache import ResponseCache
+from learnosity_sdk.request.checkpoint import Checkpoint, CheckpointStore
+from learnosity_sdk.request.ratelimit import RateLimitController
+from learnosity_sdk.request.signer import Signer
+from learnosity_sdk.utils.executor import bounded_map
+from learnosity_sdk.utils.jsoncodec import get_codec
+from learnosity_sdk.utils.jsonstream import PageParser
+from learnosity_sdk.utils.prefetch import Prefetcher
+from learnosity_sdk.utils.singleflight import SingleFlight
 from learnosity_sdk._version import __version__
 
 
+class _Response(Protocol):
+    # What _parse_page needs of a requests or httpx response
+    @property
+    def status_code(self) -> int: ...
+    @property
+    def content(self) -> bytes: ...
+    @property
+    def text(self) -> str: ...
+
+
 class DataApi(object):
+    """
+    Client for Data API
+
+    Requests are sent through a single `requests.Session`, so that
+    connections to Data API are kept alive and reused across calls and
+    across the pages of `request_iter` and `results_iter`.
+
+    The client can be used as a context manager, in which case the session
+    is closed on exit. Otherwise, call `close` once the client is no longer
+    needed.
+    """
+
+    # The request parameter holding a list of identifiers, and the number of
+    # identifiers sent per request, used by `results_iter_chunked` for each
+    # endpoint path.
+    chunk_limits: Dict[str, Tuple[str, int]] = {
+        '/itembank/items': ('references', 50),
+        '/itembank/activities': ('references', 50),
+        '/itembank/questions': ('item_references', 50),
+        '/itembank/features': ('references', 50),
+        '/sessions/responses': ('session_id', 50),
+        '/sessions/scores': ('session_id', 50),
+        '/sessions/statuses': ('session_id', 50),
+    }
+
+    # The actions whose responses may be cached or shared by identical
+    # requests, if enabled
+    read_only_actions: Tuple[str, ...] = ('get',)
+
+    # The size of the chunks read from the socket when streaming results
+    stream_chunk_size = 65536
+
+    def __init__(self, session: Optional[requests.Session] = None,
+                 pool_connections: int = 10, pool_maxsize: int = 10,
+                 max_retries: int = 0, pool_block: bool = False,
+                 keep_alive: bool = True,
+                 rate_limiter: Optional[RateLimitController] = None,
+                 cache: Optional[ResponseCache] = None,
+                 coalesce: bool = False) -> None:
+        """
+        Args:
+            session (requests.Session): An existing session to use. If given,
+                the pool arguments are ignored and the session is not
+                closed by `close`.
+            pool_connections (int): The number of host pools to cache
+            pool_maxsize (int): The maximum number of connections kept
+                alive per host
+            max_retries (int): The number of retries for failed connections
+            pool_block (bool): Whether to block when no free connection is
+                available, rather than opening a new one
+            keep_alive (bool): Whether to keep connections open between
+                requests
+            rate_limiter (RateLimitController): Retries throttled requests
+                and limits the number of requests in flight per consumer.
+                By default, requests are neither retried nor limited.
+            cache (ResponseCache): Caches the responses of read-only (`get`)
+                requests. By default, nothing is cached.
+            coalesce (bool): Whether identical read-only requests made
+                concurrently, e.g. by several threads, share a single HTTP
+                call and its result
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.coalesce = coalesce
+        self._request_flights: Optional[SingleFlight[Response]] = None
+        self._page_flights: Optional[SingleFlight[bytes]] = None
+        if coalesce:
+            self._request_flights = SingleFlight()
+            self._page_flights = SingleFlight()
+
+        self._session = session
+        self._owns_session = session is None
+        self._pid = os.getpid()
+
+    def __enter__(self) -> 'DataApi':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying session and its pooled connections
+
+        A session passed in by the caller is left open.
+        """
+        if self._session is not None and self._owns_session:
+            self._session.close()
+            self._session = None
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a session with a connection pool configured for this client.
+
+        Returns:
+            requests.Session: The new session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.max_retries,
+            pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The session used to send requests
+
+        A new session is created on first use, and again in a forked child
+        process so that pooled sockets are never shared with the parent.
+        """
+        pid = os.getpid()
+        if pid != self._pid and self._owns_session:
+            # Drop (without closing) the parent's session: closing it here
+            # would shut down sockets that the parent is still using.
+            self._session = None
+            self._pid = pid
+
+        if self._session is None:
+            self._session = self._create_session()
+            self._owns_session = True
+
+        return self._session
 
-    def _extract_consumer(self, security_packet: Dict[str, str]) -> str:
+    @classmethod
+    def _extract_consumer(cls, security_packet: Dict[str, str]) -> str:
         """
         Extract the consumer key from the security packet.
 
@@ -24,7 +189,8 @@ class DataApi(object):
         """
         return security_packet.get('consumer_key', '')
 
-    def _derive_action(self, endpoint: str, action: str) -> str:
+    @classmethod
+    def _derive_action(cls, endpoint: str, action: str) -> str:
         """
         Derive the action metadata from the endpoint and action parameter.
 
@@ -38,6 +204,37 @@ class DataApi(object):
         Returns:
             string: The derived action string
         """
+        return f"{action}_{cls._endpoint_path(endpoint)}"
+
+    @classmethod
+    def _headers(cls, endpoint: str, security_packet: Dict[str, str],
+                 action: str) -> Dict[str, str]:
+        """
+        The metadata sent as HTTP headers with each request, for routing
+
+        Returns:
+            dict: The headers
+        """
+        sdk_version = __version__.lstrip('v')
+        return {
+            'X-Learnosity-Consumer': cls._extract_consumer(security_packet),
+            'X-Learnosity-Action': cls._derive_action(endpoint, action),
+            'X-Learnosity-SDK': f'Python:{sdk_version}'
+        }
+
+    @classmethod
+    def _endpoint_path(cls, endpoint: str) -> str:
+        """
+        Extract the path of an endpoint, without its version prefix.
+
+        For example: '/itembank/items' or '/sessions/responses'
+
+        Args:
+            endpoint (string): The full url to the endpoint
+
+        Returns:
+            string: The path of the endpoint
+        """
         # Parse the URL to extract the path
         parsed_url = urlparse(endpoint)
         path = parsed_url.path.rstrip("/")
@@ -53,14 +250,16 @@ class DataApi(object):
                 first_segment in ("latest", "latest-lts", "developer")):
                 path = '/' + '/'.join(path_parts[2:])
 
-        return f"{action}_{path}"
+        return path
 
     def request(self, endpoint: str, security_packet: Dict[str, str],
-                secret: str, request_packet:Dict[str, Any] = {}, action: str = 'get') -> Response:
+                secret: Union[str, Signer], request_packet:Dict[str, Any] = {}, action: str = 'get',
+                stream: bool = False) -> Response:
         """
         Make a request to Data API
 
-        Uses the `requests` library to make a single call against Data API.
+        Uses the client's `requests.Session` to make a single call against
+        Data API.
         If the data spans multiple pages, then the meta.next property
         of the response will need to be used to obtain the rest of the data.
 
@@ -69,46 +268,97 @@ class DataApi(object):
         Args:
             endpoint (string): The full url to the endpoint
             security_packet (dict): The security object
-            secret (string): The consumer secret key
+            secret (string|Signer): The consumer secret key, or a Signer
             request_packet (dict): The request parameters
             action (string): 'get', 'set', 'update', etc.
+            stream (bool): Whether to defer downloading the response body
+                until it is accessed, e.g. with `Response.iter_content`
 
         Returns:
             requests.Response: The response object
 
             see http://docs.python-requests.org/en/master/api/#requests.Request
         """
-        init = Init('data', security_packet, secret, request_packet, action)
-
-        # Extract metadata for routing
+        key = None
+        if self._is_read_only(action, stream):
+            key = self._cache_key(endpoint, security_packet, secret, request_packet, action)
+            entry = self._cache_get(key)
+            if entry is not None:
+                content, data, _ = entry
+                if content is None:
+                    content = json.dumps(data).encode('utf-8')
+                return self._cached_response(endpoint, content)
+
+        def fetch() -> Response:
+            res = self._send(endpoint, security_packet, secret, request_packet,
+                             action, stream)
+            if key is not None and self.cache is not None and res.status_code == 200:
+                # Only cache successful pages, so that errors are not replayed
+                try:
+                    self._parse_page(res)
+                except DataApiException:
+                    return res
+                self.cache.set(key, self._cache_entry(res.content, None, len(res.content)))
+            return res
+
+        if key is not None and self._request_flights is not None:
+            return self._request_flights.do(key, fetch)
+        return fetch()
+
+    def _send(self, endpoint: str, security_packet: Dict[str, str],
+              secret: Union[str, Signer], request_packet: Dict[str, Any], action: str,
+              stream: bool = False) -> Response:
+        """
+        Sign and send a request to Data API, bypassing the cache
+        """
+        # Add metadata as HTTP headers for ALB routing
         consumer = self._extract_consumer(security_packet)
-        derived_action = self._derive_action(endpoint, action)
+        headers = self._headers(endpoint, security_packet, action)
 
-        # Add metadata as HTTP headers for ALB routing
-        sdk_version = __version__.lstrip('v')
-        headers = {
-            'X-Learnosity-Consumer': consumer,
-            'X-Learnosity-Action': derived_action,
-            'X-Learnosity-SDK': f'Python:{sdk_version}'
-        }
+        def send() -> Response:
+            # Signed for each attempt, so that retries carry a fresh timestamp
+            init = Init('data', security_packet, secret, request_packet, action)
+            return self.session.post(endpoint, data=init.generate(), headers=headers,
+                                     stream=stream)
 
-        return requests.post(endpoint, data=init.generate(), headers=headers)
+        if self.rate_limiter is None:
+            return send()
+        return self.rate_limiter.call(consumer, send)
 
     def results_iter(self, endpoint: str, security_packet: Dict[str, str],
-                     secret: str, request_packet: Dict[str, Any] = {},
-                     action:str = 'get') -> Generator[Dict[str, Any], None, None]:
+                     secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                     action:str = 'get', prefetch: int = 0,
+                     prefetch_max_bytes: Optional[int] = None,
+                     stream: bool = False,
+                     checkpoint: Optional[CheckpointStore] = None,
+                     checkpoint_key: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
         """
         Return an iterator of all results from a request to Data API
 
         This method yields each element of the `data` result array,
         automatically fetching the next page of results when needed.
 
+        If `stream` is set, each page is parsed incrementally as it is
+        received, and each result is yielded as soon as it is complete, so
+        that memory use is bounded by the size of a result rather than of a
+        page. Streaming cannot be combined with prefetching. If the server
+        puts `meta` after `data`, an unsuccessful status is only detected
+        after the results of the page have been yielded.
+
         Args:
             endpoint (string): The full url to the endpoint
             security_packet (dict): The security object
-            secret (string): The consumer secret key
+            secret (string|Signer): The consumer secret key, or a Signer
             request_packet (dict): The request parameters
             action (string): 'get', 'set', 'update', etc.
+            prefetch (int): The number of pages to fetch ahead, see
+                `request_iter`
+            prefetch_max_bytes (int): The maximum size of the buffered
+                response bodies, see `request_iter`
+            stream (bool): Whether to parse pages incrementally
+            checkpoint (CheckpointStore): The store to save progress to, see
+                `request_iter`
+            checkpoint_key (string): The key to save progress under
 
         Yields:
             dict: An individual result (item, question, etc.) from the server
@@ -117,30 +367,212 @@ class DataApi(object):
             DataApiException: Raised if there was a problem fetching
             data or if the server returns an invalid response.
         """
+        if stream:
+            if prefetch > 0 or checkpoint is not None:
+                raise ValueError(
+                    'stream cannot be combined with prefetch or checkpoint')
+            yield from self._stream_results(endpoint, security_packet, secret,
+                                            request_packet, action)
+            return
+
         for response in self.request_iter(endpoint, security_packet,
                                           secret, request_packet,
-                                          action):
-            if type(response['data']) == dict:
-                for key, value in response['data'].items():
-                    yield {key: value}
+                                          action, prefetch,
+                                          prefetch_max_bytes, checkpoint,
+                                          checkpoint_key):
+            yield from self._page_results(response)
+
+    def resume_results_iter(self, endpoint: str, security_packet: Dict[str, str],
+                            secret: Union[str, Signer], request_packet: Dict[str, Any],
+                            action: str, checkpoint: CheckpointStore,
+                            checkpoint_key: Optional[str] = None, prefetch: int = 0,
+                            prefetch_max_bytes: Optional[int] = None) -> Generator[Dict[str, Any], None, None]:
+        """
+        Continue iterating over the results of a query from its last checkpoint
+
+        Results are resumed from the first page that was not acknowledged,
+        so results of a partially consumed page are returned again. See
+        `resume_iter` and `results_iter`.
+        """
+        for response in self.resume_iter(endpoint, security_packet, secret,
+                                         request_packet, action, checkpoint,
+                                         checkpoint_key, prefetch,
+                                         prefetch_max_bytes):
+            yield from self._page_results(response)
+
+    def results_iter_chunked(self, endpoint: str, security_packet: Dict[str, str],
+                             secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                             action: str = 'get', chunk_key: Optional[str] = None,
+                             chunk_size: Optional[int] = None, max_workers: int = 4,
+                             preserve_order: bool = False) -> Generator[Dict[str, Any], None, None]:
+        """
+        Return an iterator of all results of a request for a large list of
+        identifiers
+
+        The list of identifiers in `request_packet[chunk_key]` is split into
+        chunks of `chunk_size`, and each chunk is requested separately,
+        following `meta.next` within the chunk. Up to `max_workers` chunks are
+        requested concurrently. The results of all chunks are merged into a
+        single stream, in the order the chunks complete, or in the order of
+        the identifiers if `preserve_order` is set.
+
+        `chunk_key` and `chunk_size` default to the values in `chunk_limits`
+        for the endpoint.
+
+        Args:
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            request_packet (dict): The request parameters
+            action (string): 'get', 'set', 'update', etc.
+            chunk_key (string): The request parameter holding the identifiers
+            chunk_size (int): The number of identifiers per request
+            max_workers (int): The maximum number of chunks in flight
+            preserve_order (bool): Whether to yield the results of each chunk
+                in the order of the identifiers
+
+        Yields:
+            dict: An individual result (item, question, etc.) from the server
+
+        Raises:
+            DataApiException: Raised if there was a problem fetching
+            data or if the server returns an invalid response.
+            ValueError: Raised if no chunk key or size is known for the
+            endpoint.
+        """
+        limit = self.chunk_limits.get(self._endpoint_path(endpoint))
+        if chunk_key is None or chunk_size is None:
+            if limit is None:
+                raise ValueError(
+                    'No chunk limit known for endpoint: {}'.format(endpoint))
+            chunk_key = limit[0] if chunk_key is None else chunk_key
+            chunk_size = limit[1] if chunk_size is None else chunk_size
+
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+
+        values = request_packet.get(chunk_key)
+        if not isinstance(values, list) or len(values) <= chunk_size:
+            yield from self.results_iter(endpoint, security_packet, secret,
+                                         request_packet, action)
+            return
+
+        chunks = (
+            dict(request_packet, **{chunk_key: values[i:i + chunk_size]})
+            for i in range(0, len(values), chunk_size))
+
+        def fetch_chunk(chunk_request: Dict[str, Any]) -> List[Dict[str, Any]]:
+            return list(self.results_iter(endpoint, security_packet, secret,
+                                          chunk_request, action))
+
+        for results in bounded_map(fetch_chunk, chunks, max_workers,
+                                   preserve_order):
+            yield from results
+
+    def _stream_results(self, endpoint: str, security_packet: Dict[str, str],
+                        secret: Union[str, Signer], request_packet: Dict[str, Any],
+                        action: str) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the results of successive pages, parsing each page incrementally
+        """
+        security_packet = copy.deepcopy(security_packet)
+        request_packet = copy.deepcopy(request_packet)
+
+        data_end = False
+
+        while not data_end:
+            res = self.request(endpoint, security_packet, secret,
+                               request_packet, action, stream=True)
+            with res:
+                if not res.ok:
+                    raise DataApiException(
+                        'server returned HTTP status ' + str(res.status_code)
+                        + ': ' + res.text)
+
+                parser = PageParser()
+                try:
+                    for chunk in res.iter_content(chunk_size=self.stream_chunk_size):
+                        for result in parser.feed(chunk):
+                            self._check_page_status(parser.meta)
+                            yield result
+                    for result in parser.close():
+                        yield result
+                except ValueError as e:
+                    raise DataApiException(
+                        'server returned invalid json: ' + str(e))
+
+            meta = parser.meta
+            if 'status' not in meta:
+                raise DataApiException(
+                    'server returned invalid json: missing meta.status')
+            self._check_page_status(meta)
+
+            if 'next' in meta and parser.count > 0:
+                request_packet['next'] = meta['next']
             else:
-                for result in response['data']:
-                    yield result
+                data_end = True
+
+    @staticmethod
+    def _check_page_status(meta: Dict[str, Any]) -> None:
+        "Raise if the `meta` of a streamed page reports a failure"
+        if 'status' in meta and not meta['status']:
+            raise DataApiException(
+                'server returned unsuccessful status: ' + json.dumps(meta))
+
+    @staticmethod
+    def _page_results(page: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the individual results of a page of results
+
+        Args:
+            page (dict): A page returned by `request_iter`
+
+        Yields:
+            dict: An individual result from the page
+        """
+        if type(page['data']) == dict:
+            for key, value in page['data'].items():
+                yield {key: value}
+        else:
+            for result in page['data']:
+                yield result
 
     def request_iter(self, endpoint: str, security_packet: Dict[str, str],
-                     secret: str, request_packet: Dict[str, Any] = {},
-                     action: str = 'get') -> Generator[Dict[str, Any], None, None]:
+                     secret: Union[str, Signer], request_packet: Dict[str, Any] = {},
+                     action: str = 'get', prefetch: int = 0,
+                     prefetch_max_bytes: Optional[int] = None,
+                     checkpoint: Optional[CheckpointStore] = None,
+                     checkpoint_key: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
         """
         Iterate over the pages of results of a query to data api
 
         Additional requests are sent to to Data API to fetch pages as needed.
 
+        If a `checkpoint` store is given, a `Checkpoint` with the `meta.next`
+        cursor and the number of results so far is saved each time a page
+        is acknowledged, that is, when the consumer asks for the following
+        page. `resume_iter` can then continue an interrupted query from the
+        last acknowledged page.
+
+        If `prefetch` is set, pages are fetched on a background thread: the
+        request for the next page is sent as soon as the current one has
+        been parsed, rather than when the consumer asks for it. At most
+        `prefetch` pages are held ahead of the consumer, and fetching pauses
+        while the buffered pages' bodies add up to `prefetch_max_bytes`.
+
         Args:
             endpoint (string): The full url to the endpoint
             security_packet (dict): The security object
-            secret (string): The consumer secret key
+            secret (string|Signer): The consumer secret key, or a Signer
             request_packet (dict): The request parameters
             action (string): 'get', 'set', 'update', etc.
+            prefetch (int): The number of pages to fetch ahead, or 0 to fetch
+                each page only when it is needed
+            prefetch_max_bytes (int): The maximum size of the buffered
+                response bodies, or None for no limit
+            checkpoint (CheckpointStore): The store to save progress to
+            checkpoint_key (string): The key to save progress under. Defaults
+                to a hash of the endpoint, action and request.
 
         Yields:
             dict: The response from the server
@@ -151,16 +583,112 @@ class DataApi(object):
             DataApiException: Raised if there was a problem fetching
             data or if the server returns an invalid response.
         """
+        return self._request_iter(endpoint, security_packet, secret,
+                                  request_packet, action, prefetch,
+                                  prefetch_max_bytes, checkpoint,
+                                  checkpoint_key, resume=False)
+
+    def resume_iter(self, endpoint: str, security_packet: Dict[str, str],
+                    secret: Union[str, Signer], request_packet: Dict[str, Any],
+                    action: str, checkpoint: CheckpointStore,
+                    checkpoint_key: Optional[str] = None, prefetch: int = 0,
+                    prefetch_max_bytes: Optional[int] = None) -> Generator[Dict[str, Any], None, None]:
+        """
+        Continue iterating over the pages of a query from its last checkpoint
+
+        The query must be given with the same arguments as the interrupted
+        call to `request_iter` (or the same `checkpoint_key`). The page
+        following the last acknowledged one is requested with a freshly
+        signed request, and progress keeps being saved to `checkpoint`. If
+        no checkpoint was saved, the query starts from the first page; if
+        the query had completed, nothing is yielded.
 
+        See `request_iter` for the arguments.
+        """
+        return self._request_iter(endpoint, security_packet, secret,
+                                  request_packet, action, prefetch,
+                                  prefetch_max_bytes, checkpoint,
+                                  checkpoint_key, resume=True)
+
+    def _request_iter(self, endpoint: str, security_packet: Dict[str, str],
+                      secret: Union[str, Signer], request_packet: Dict[str, Any], action: str,
+                      prefetch: int, prefetch_max_bytes: Optional[int],
+                      checkpoint: Optional[CheckpointStore],
+                      checkpoint_key: Optional[str],
+                      resume: bool) -> Generator[Dict[str, Any], None, None]:
         # just in case the security_packet or request_packet
         # are modified between yields
         security_packet = copy.deepcopy(security_packet)
         request_packet = copy.deepcopy(request_packet)
 
+        count = 0
+        if checkpoint is not None:
+            if checkpoint_key is None:
+                checkpoint_key = self._checkpoint_key(endpoint, security_packet,
+                                                      request_packet, action)
+            saved = checkpoint.load(checkpoint_key) if resume else None
+            if saved is not None:
+                if saved.complete:
+                    return
+                if saved.next is not None:
+                    request_packet['next'] = saved.next
+                count = saved.result_count
+
+        pages = self._iter_pages(endpoint, security_packet, secret,
+                                 request_packet, action)
+
+        prefetcher = None
+        if prefetch > 0:
+            prefetcher = Prefetcher(pages, prefetch, prefetch_max_bytes)
+            page_iter: Iterator[Dict[str, Any]] = prefetcher
+        else:
+            page_iter = (data for data, _ in pages)
+
+        try:
+            for data in page_iter:
+                yield data
+
+                if checkpoint is not None and checkpoint_key is not None:
+                    count += len(data['data'])
+                    has_next = self._has_next_page(data)
+                    checkpoint.save(checkpoint_key, Checkpoint(
+                        data['meta']['next'] if has_next else None,
+                        count, not has_next))
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
+
+    def _checkpoint_key(self, endpoint: str, security_packet: Dict[str, str],
+                        request_packet: Dict[str, Any], action: str) -> str:
+        """
+        Derive a checkpoint key identifying a query
+
+        Returns:
+            string: A hash of the consumer, endpoint, action and request
+        """
+        query = json.dumps([
+            self._extract_consumer(security_packet),
+            self._endpoint_path(endpoint),
+            action,
+            {k: v for k, v in request_packet.items() if k != 'next'},
+        ], sort_keys=True)
+        return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+    def _iter_pages(self, endpoint: str, security_packet: Dict[str, str],
+                    secret: Union[str, Signer], request_packet: Dict[str, Any],
+                    action: str) -> Generator[Tuple[Dict[str, Any], int], None, None]:
+        """
+        Fetch successive pages of results, following `meta.next`
+
+        `request_packet` is updated with the cursor of each page.
+
+        Yields:
+            tuple: The decoded page, and the size of the response body
+        """
         data_end = False
 
         while not data_end:
-            res = self.request(
+            data, size = self._fetch_page(
                 endpoint,
                 security_packet,
                 secret,
@@ -168,24 +696,190 @@ class DataApi(object):
                 action
             )
 
-            if not res.ok:
-                raise DataApiException(
-                    'server returned HTTP status ' + str(res.status_code)
-                    + ': ' + res.text)
-
-            try:
-                data = res.json()
-            except ValueError:
-                raise DataApiException(
-                    'server returned invalid json: ' + res.text)
-
-            if 'next' in data['meta'] and len(data['data']) > 0:
+            if self._has_next_page(data):
                 request_packet['next'] = data['meta']['next']
             else:
                 data_end = True
 
-            if not data['meta']['status']:
-                raise DataApiException(
-                    'server returned unsuccessful status: ' + res.text)
-            else:
-                yield data
+            yield data, size
+
+    def _fetch_page(self, endpoint: str, security_packet: Dict[str, str],
+                    secret: Union[str, Signer], request_packet: Dict[str, Any],
+                    action: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Fetch and parse a single page of results, using the cache if enabled
+
+        On a cache hit, neither the request nor the JSON decoding is repeated.
+
+        Returns:
+            tuple: The decoded page, and the size of the response body
+        """
+        key = None
+        if self._is_read_only(action):
+            key = self._cache_key(endpoint, security_packet, secret, request_packet, action)
+            entry = self._cache_get(key)
+            if entry is not None:
+                content, data, size = entry
+                if data is None and content is not None:
+                    data = self._parse_page(self._cached_response(endpoint, content))
+                return data, size
+
+        if key is not None and self._page_flights is not None:
+            # Every caller decodes its own copy of the shared page, so that
+            # callers cannot see each other's changes to it
+            page_key = key
+            value = self._page_flights.do(key, lambda: self._fetch_page_entry(
+                endpoint, security_packet, secret, request_packet, action,
+                page_key))
+            _, data, size = marshal.loads(value)
+            return data, size
+
+        res = self._send(endpoint, security_packet, secret, request_packet, action)
+        data = self._parse_page(res)
+
+        if key is not None and self.cache is not None:
+            self.cache.set(key, self._cache_entry(None, data, len(res.content)))
+
+        return data, len(res.content)
+
+    def _fetch_page_entry(self, endpoint: str, security_packet: Dict[str, str],
+                          secret: Union[str, Signer], request_packet: Dict[str, Any],
+                          action: str, key: str) -> bytes:
+        """
+        Fetch and parse a single page of results, as a cache entry
+        """
+        res = self._send(endpoint, security_packet, secret, request_packet, action)
+        data = self._parse_page(res)
+        value = self._cache_entry(None, data, len(res.content))
+        if self.cache is not None:
+            self.cache.set(key, value)
+        return value
+
+    def _is_read_only(self, action: str, stream: bool = False) -> bool:
+        """
+        Whether a request may be answered from the cache or shared with
+        identical requests in flight
+        """
+        return (action in self.read_only_actions and not stream
+                and (self.cache is not None or self.coalesce))
+
+    def _cache_key(self, endpoint: str, security_packet: Dict[str, str],
+                   secret: Union[str, Signer], request_packet: Dict[str, Any],
+                   action: str) -> str:
+        """
+        Derive a key identifying identical requests
+
+        The signature, timestamp and expiry of the security packet, and the
+        SDK telemetry of the request, are left out, as they change between
+        otherwise identical requests. The key is an HMAC with the secret, so
+        that a request with the wrong secret is never answered from a
+        response fetched with the right one.
+
+        Returns:
+            string: A keyed hash of the endpoint, action, security and request
+        """
+        security = {k: v for k, v in security_packet.items()
+                    if k not in ('signature', 'timestamp', 'expires')}
+
+        request = request_packet
+        meta = request_packet.get('meta')
+        if isinstance(meta, dict) and 'sdk' in meta:
+            request = dict(request_packet)
+            request['meta'] = {k: v for k, v in meta.items() if k != 'sdk'}
+
+        query = json.dumps([endpoint, action, security, request], sort_keys=True,
+                           separators=(',', ':'), ensure_ascii=False)
+        key = secret.secret if isinstance(secret, Signer) else secret
+        return hmac.new(key.encode('utf-8'), query.encode('utf-8'),
+                        hashlib.sha256).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Tuple[Optional[bytes], Any, int]]:
+        """
+        Look up a cache entry, as the response body and/or the decoded page,
+        and the size of the body
+        """
+        if self.cache is None:
+            return None
+        value = self.cache.get(key)
+        if value is None:
+            return None
+        try:
+            content, data, size = marshal.loads(value)
+        except (EOFError, ValueError, TypeError):
+            # Written by another version of Python, or corrupted
+            return None
+        return content, data, size
+
+    @staticmethod
+    def _cache_entry(content: Optional[bytes], data: Any, size: int) -> bytes:
+        """
+        Serialise a cache entry from the response body and/or decoded page
+        """
+        # marshal only handles the types produced by decoding JSON, and is
+        # much faster to load than re-parsing the JSON
+        return marshal.dumps((content, data, size))
+
+    @staticmethod
+    def _cached_response(endpoint: str, content: bytes) -> Response:
+        """
+        Build a response object for a cached response body
+        """
+        res = Response()
+        res.status_code = 200
+        res.reason = 'OK'
+        res.url = endpoint
+        res.encoding = 'utf-8'
+        res.headers['Content-Type'] = 'application/json'
+        res._content = content
+        return res
+
+    @staticmethod
+    def _parse_page(res: '_Response') -> Dict[str, Any]:
+        """
+        Parse and validate a page of results returned by Data API
+
+        Args:
+            res (requests.Response|httpx.Response): The response to a Data
+                API request
+
+        Returns:
+            dict: The decoded response
+
+        Raises:
+            DataApiException: Raised if the server returned an error or an
+            invalid response.
+        """
+        if res.status_code >= 400:
+            raise DataApiException(
+                'server returned HTTP status ' + str(res.status_code)
+                + ': ' + res.text)
+
+        try:
+            data: Dict[str, Any] = get_codec().loads(res.content)
+        except ValueError:
+            raise DataApiException(
+                'server returned invalid json: ' + res.text)
+
+        try:
+            status = data['meta']['status']
+        except (KeyError, TypeError):
+            raise DataApiException(
+                'server returned an invalid response: ' + res.text)
+        if not status:
+            raise DataApiException(
+                'server returned unsuccessful status: ' + res.text)
+
+        return data
+
+    @staticmethod
+    def _has_next_page(data: Dict[str, Any]) -> bool:
+        """
+        Check whether a page of results is followed by another page
+
+        Args:
+            data (dict): A decoded page of results
+
+        Returns:
+            bool: True if `meta.next` should be used to fetch another page
+        """
+        return 'next' in data['meta'] and len(data['data']) > 0
@@ -1,13 +1,28 @@
 
+import collections
 import datetime
 import hashlib
-import hmac
+import itertools
 import json
 import platform
-from typing import Any, Dict, Iterable, Optional, Union
+import time
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional,
+    Tuple, Union, cast)
 from learnosity_sdk._version import __version__
 
 from learnosity_sdk.exceptions import ValidationException
+from learnosity_sdk.request.signer import SignatureCache, Signer, UserHashCache
+from learnosity_sdk.request.template import ActivityTemplate, PreparedRequest
+from learnosity_sdk.utils.jsoncodec import get_codec
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+    from multiprocessing.context import BaseContext
+
+
+# The placeholder values a signature can be cached for
+_SCALAR_TYPES = (str, int, float, bool, type(None))
 
 
 def format_utc_time() -> str:
@@ -33,24 +48,341 @@ class Init(object):
 
     __telemetry_enabled = True
 
+    __signature_cache: Optional[SignatureCache] = None
+
+    __user_hash_cache: Optional[UserHashCache] = None
+
+    # The telemetry meta, and its serialisation
+    __sdk_meta: Optional[Tuple[Dict[str, str], str]] = None
+
+    # Whether signing has been deferred, see __init__
+    _pending = False
+    _request_string_ready = False
+    # Whether add_telemetry_data added the meta key to the request
+    _sdk_meta_appended = False
+
+    # The size of the chunks written by generate_stream
+    stream_chunk_size = 65536
+
     def __init__(
-            self, service: str, security: Dict[str, Any], secret: str,
-            request: Optional[Union[Dict[str, Any], str]] = None, action:Optional[str] = None) -> None:
+            self, service: str, security: Dict[str, Any], secret: Union[str, Signer],
+            request: Optional[Union[Dict[str, Any], str]] = None, action:Optional[str] = None,
+            lazy: bool = False, trusted: bool = False) -> None:
+        """
+        If lazy is True, serialising the request and signing are deferred
+        until the request string, the security packet or the output are first
+        used, and then done once. Until then, the request of an assess Init
+        does not have its Questions API signature.
+
+        If trusted is True, the service, secret, action and security packet
+        are not validated, e.g. because they come from a `ValidatedSecurity`.
+        A missing timestamp is still added.
+        """
         self.service = service
         self.security = security.copy()
-        self.secret = secret
+        if isinstance(secret, Signer):
+            self.signer = secret
+            self.secret = secret.secret
+        else:
+            self.signer = Signer(secret)
+            self.secret = secret
         self.request = request
         # TODO: Fix improper handling when request is a string
         if isinstance(request, dict):
             self.request = request.copy()
         self.action = action
 
-        self.validate()
-        self.add_telemetry_data()
-        self.request_string = self.generate_request_string()
+        if trusted:
+            self.parse_request()
+            if 'timestamp' not in self.security:
+                self.security['timestamp'] = format_utc_time()
+        else:
+            self.validate()
+        self._sign(lazy=lazy)
+
+    @classmethod
+    def _trusted(
+            cls, service: str, security: Dict[str, Any], signer: Signer,
+            request: Optional[Union[Dict[str, Any], str]], action: Optional[str],
+            sdk_meta: Optional[Dict[str, str]], telemetry_enabled: bool) -> 'Init':
+        # Build an Init from a security packet that has already been validated.
+        # Telemetry is passed in, as worker processes may not share the
+        # class setting.
+        init = cls.__new__(cls)
+        init.__telemetry_enabled = telemetry_enabled
+        init.service = service
+        init.security = security.copy()
+        init.signer = signer
+        init.secret = signer.secret
+        init.request = request
+        if isinstance(request, dict):
+            init.request = request.copy()
+        init.action = action
+        init.parse_request()
+        init._sign(sdk_meta)
+        return init
+
+    def _sign(self, sdk_meta: Optional[Dict[str, str]] = None, lazy: bool = False) -> None:
+        self.add_telemetry_data(sdk_meta)
+        self._request_string_ready = False
         self.sign_request_data = True
-        self.set_service_options()
-        self.security['signature'] = self.generate_signature()
+        self._encoded_security: Optional[str] = None
+        self._pending = True
+        if not lazy:
+            self._finish()
+
+    def _finish(self) -> None:
+        # The deferred steps of signing, run once
+        self._pending = False
+        try:
+            # Serialised before the service options change the request. A
+            # PreparedRequest is serialised from its template, so is left
+            # until it is needed, which a cached signature may avoid.
+            if not isinstance(self.request, PreparedRequest):
+                self.request_string
+            self.set_service_options()
+            self.security['signature'] = self.generate_signature()
+        except BaseException:
+            self._pending = True
+            raise
+
+    @property
+    def security(self) -> Dict[str, Any]:
+        if self._pending:
+            self._finish()
+        return self._security
+
+    @security.setter
+    def security(self, security: Dict[str, Any]) -> None:
+        self._security = security
+
+    @property
+    def request_string(self) -> Optional[str]:
+        if not self._request_string_ready:
+            self._request_string = self.generate_request_string()
+            self._request_string_ready = True
+        return self._request_string
+
+    @request_string.setter
+    def request_string(self, request_string: Optional[str]) -> None:
+        self._request_string = request_string
+        self._request_string_ready = True
+
+    @classmethod
+    def generate_many(
+            cls, service: str, security_template: Dict[str, Any],
+            secret: Union[str, Signer],
+            requests: Iterable[Optional[Union[Dict[str, Any], str]]],
+            action: Optional[str] = None, encode: bool = True,
+            processes: Optional[int] = None,
+            chunk_size: int = 1000,
+            mp_context: Optional['BaseContext'] = None) -> Iterator[Union[str, Dict[str, Any]]]:
+        """
+        Generate the signed packets for many requests sharing a security
+        packet, e.g. an Items API packet per student.
+
+        The service, secret and security template are validated once, the
+        timestamp (if missing) and telemetry meta are computed once, and the
+        keyed HMAC is reused for every request. The `user_id` of each packet
+        is taken from its request where the service allows it.
+
+        Args:
+            service (string): The service, e.g. 'items'
+            security_template (dict): The security packet shared by all
+                requests
+            secret (string|Signer): The consumer secret key, or a Signer
+            requests (iterable): The request packets
+            action (string): The action, if any, shared by all requests
+            encode (bool): See `generate`
+            processes (int): If set, sign chunks of `chunk_size` requests on
+                a pool of that many processes
+            chunk_size (int): The number of requests per chunk sent to a
+                process
+            mp_context (multiprocessing.context.BaseContext): The context to
+                start the processes with, e.g. `get_context('spawn')`
+
+        Returns:
+            iterator: The output of `generate` for each request, in order
+
+        Raises:
+            ValueError: If `processes` or `chunk_size` is less than 1
+        """
+        if processes is not None and processes < 1:
+            raise ValueError('processes must be at least 1')
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+
+        signer = secret if isinstance(secret, Signer) else Signer(secret)
+        template = cls.__new__(cls)
+        template.service = service
+        template.security = security_template.copy()
+        template.signer = signer
+        template.secret = signer.secret
+        template.request = None
+        template.action = action
+        template.validate()
+
+        security = template.security
+        telemetry_enabled = template.is_telemetry_enabled()
+        sdk_meta = template.get_sdk_meta() if telemetry_enabled else None
+
+        if processes is None:
+            return (
+                cls._trusted(service, security, signer, request, action,
+                             sdk_meta, telemetry_enabled).generate(encode)
+                for request in requests)
+
+        return cls._generate_chunks(service, security, signer.secret, requests,
+                                    action, encode, sdk_meta, telemetry_enabled,
+                                    processes, chunk_size, mp_context)
+
+    @classmethod
+    def _generate_chunks(
+            cls, service: str, security: Dict[str, Any], secret: str,
+            requests: Iterable[Optional[Union[Dict[str, Any], str]]],
+            action: Optional[str], encode: bool,
+            sdk_meta: Optional[Dict[str, str]], telemetry_enabled: bool,
+            processes: int, chunk_size: int,
+            mp_context: Optional['BaseContext']) -> Iterator[Union[str, Dict[str, Any]]]:
+        values = iter(requests)
+        chunks = iter(lambda: list(itertools.islice(values, chunk_size)), [])
+        pending: Deque['Future[List[Union[str, Dict[str, Any]]]]'] = collections.deque()
+        # Imported here, as multiprocessing is slow to import
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context) as executor:
+            try:
+                # Keep every process busy, without reading all the requests
+                for chunk in itertools.chain(chunks, [None]):
+                    if chunk is not None:
+                        pending.append(executor.submit(
+                            _generate_chunk, service, security, secret, chunk,
+                            action, encode, sdk_meta, telemetry_enabled))
+                    while pending and (chunk is None or len(pending) > processes * 2):
+                        yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @classmethod
+    def generate_stream(
+            cls, write: Callable[[str], Any], service: str,
+            security: Dict[str, Any], secret: Union[str, Signer],
+            request: Optional[Union[Dict[str, Any], str]] = None,
+            action: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generate the encoded output, as `generate` does, writing it to `write`
+        in chunks.
+
+        The request is encoded incrementally, and each chunk is fed to the
+        signature as it is written, so the request string is never built in
+        full. This suits requests of several megabytes, e.g. with thousands
+        of inline questions. The signature is the same as `Init` gives.
+
+        As the signature is only known once the request has been written, the
+        security packet follows the request in the output for the services
+        that sign it (e.g. items and author).
+
+        Args:
+            write (callable): Called with each chunk of the output
+            service (string): The service, e.g. 'author'
+            security (dict): The security packet
+            secret (string|Signer): The consumer secret key, or a Signer
+            request (dict): The request packet
+            action (string): The action, if any
+
+        Returns:
+            dict: The security packet, with its signature
+        """
+        if service == 'data':
+            raise ValidationException(
+                "The data service output cannot be streamed")
+
+        init = cls.__new__(cls)
+        init.service = service
+        init.security = security.copy()
+        if isinstance(secret, Signer):
+            init.signer = secret
+            init.secret = secret.secret
+        else:
+            init.signer = Signer(secret)
+            init.secret = secret
+        init.request = request
+        if isinstance(request, dict):
+            init.request = request.copy()
+        init.action = action
+
+        init.validate()
+        init.add_telemetry_data()
+        init.request_string = None
+        init.sign_request_data = True
+        init.set_service_options()
+        init._encoded_security = None
+
+        if init.request is None:
+            init.security['signature'] = init.generate_signature()
+            write(cast(str, init.generate()))
+            return init.security
+
+        def request_chunks() -> Iterator[str]:
+            encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+            buffer: List[str] = []
+            size = 0
+            for chunk in encoder.iterencode(init.request):
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= cls.stream_chunk_size:
+                    yield ''.join(buffer)
+                    buffer = []
+                    size = 0
+            yield ''.join(buffer)
+
+        def write_request(chunk: str) -> None:
+            if '\u2028' in chunk or '\u2029' in chunk:
+                chunk = chunk.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+            write(chunk)
+
+        if init.sign_request_data:
+            # The request, signed as it is written, then the security packet
+            write('{"request": ')
+
+            def signed() -> Iterator[str]:
+                for key in init.security_keys:
+                    if key in init.security:
+                        yield init.security[key] + '_'
+                for chunk in request_chunks():
+                    write_request(chunk)
+                    yield chunk
+                if init.action is not None:
+                    yield '_' + init.action
+
+            init.security['signature'] = init.signer.hash_stream(signed())
+            if init.action is not None:
+                write(', "action": ' + json.dumps(init.action))
+            write(', "security": ' + init.encoded_security() + '}')
+            return init.security
+
+        init.security['signature'] = init.generate_signature()
+        if service == 'questions':
+            questions_security = {k: v for k, v in init.security.items() if k != 'domain'}
+            if not isinstance(init.request, dict) or not init.request or \
+                    not init.request.keys().isdisjoint(questions_security):
+                write(cast(str, init.generate()))
+                return init.security
+            # Merge the security packet into the root of the request
+            write(json.dumps(questions_security)[:-1] + ', ')
+            chunks = request_chunks()
+            write_request(next(chunks)[1:])
+        elif service == 'events':
+            write('{"security": ' + init.encoded_security() + ', "config": ')
+            chunks = request_chunks()
+        else:
+            chunks = request_chunks()
+
+        for chunk in chunks:
+            write_request(chunk)
+        if service == 'events':
+            write('}')
+        return init.security
 
     def is_telemetry_enabled(self) -> bool:
         return self.__telemetry_enabled
@@ -63,6 +395,9 @@ class Init(object):
         If encode is True, the result is a JSON string. Otherwise, it's a
         dictionary. If self.service == data, encode is ignored.
         """
+        if self._pending:
+            self._finish()
+
         output = {}
 
         if self.service == 'questions':
@@ -85,7 +420,7 @@ class Init(object):
                 output.update(self.request)
         elif self.service == 'data':
             # We ignore the encode param for data API
-            output['security'] = json.dumps(self.security)
+            output['security'] = self.encoded_security()
 
             if self.request_string is not None:
                 output['request'] = self.request_string
@@ -104,18 +439,74 @@ class Init(object):
                 output['action'] = self.action
 
         if encode or self.request_passed_as_string:
-            return json.dumps(output)
+            return self._encode(output)
         else:
             return output
 
+    def generate_bytes(self) -> bytes:
+        """
+        Generate the data necessary to make a request, as UTF-8 encoded JSON,
+        e.g. for the body of a WSGI or ASGI response.
+        """
+        output = self.generate()
+        if isinstance(output, dict):
+            output = json.dumps(output)
+        return output.encode('utf-8')
+
+    def encoded_security(self) -> str:
+        "The security packet, encoded as JSON"
+        if self._encoded_security is None:
+            self._encoded_security = json.dumps(self.security)
+        return self._encoded_security
+
+    def _encode(self, output: Dict[str, Any]) -> str:
+        # Splice in the request string, rather than encoding the request again
+        if self.request_string is None or self.service == 'assess':
+            return json.dumps(output)
+
+        request = self.request_string
+        if '\u2028' in request or '\u2029' in request:
+            # Still safe to embed in a script
+            request = request.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+        if self.service == 'questions':
+            security = {k: v for k, v in self.security.items() if k != 'domain'}
+            if not security or not isinstance(self.request, dict) or not self.request \
+                    or not self.request.keys().isdisjoint(security):
+                return json.dumps(output)
+            return json.dumps(security)[:-1] + ', ' + request[1:]
+
+        parts = ['{"security": ', self.encoded_security()]
+        if self.service == 'events':
+            parts += [', "config": ', request]
+        else:
+            parts += [', "request": ', request]
+            if self.action is not None:
+                parts += [', "action": ', json.dumps(self.action)]
+        parts.append('}')
+        return ''.join(parts)
+
     def get_sdk_meta(self) -> Dict[str, str]:
-        return {
-            'version': self.get_sdk_version(),
-            'lang': 'python',
-            'lang_version': platform.python_version(),
-            'platform': platform.system(),
-            'platform_version': platform.release()
-        }
+        # Computed once per process, until telemetry is toggled
+        cached = Init.__sdk_meta
+        if cached is None:
+            meta = {
+                'version': self.get_sdk_version(),
+                'lang': 'python',
+                'lang_version': platform.python_version(),
+                'platform': platform.system(),
+                'platform_version': platform.release()
+            }
+            cached = (meta, get_codec().dumps(meta))
+            Init.__sdk_meta = cached
+        return dict(cached[0])
+
+    def _sdk_meta_json(self, sdk_meta: Any) -> Optional[str]:
+        # The cached serialisation of the telemetry meta, if it is current
+        cached = Init.__sdk_meta
+        if cached is not None and sdk_meta == cached[0]:
+            return cached[1]
+        return None
 
     def get_sdk_version(self) -> str:
         return __version__
@@ -123,9 +514,33 @@ class Init(object):
     def generate_request_string(self) -> Union[str, None]:
         if self.request is None:
             return None
-        return json.dumps(self.request, separators=(',', ':'), ensure_ascii=False)
+        if isinstance(self.request, PreparedRequest):
+            sdk_meta = None
+            if self.is_telemetry_enabled():
+                sdk_meta = self.request['meta']['sdk']
+            return self.request.request_string(sdk_meta, self._sdk_meta_json(sdk_meta))
+
+        if self._sdk_meta_appended and isinstance(self.request, dict):
+            meta = self.request.get('meta')
+            fragment = None
+            if isinstance(meta, dict) and list(meta) == ['sdk']:
+                fragment = self._sdk_meta_json(meta['sdk'])
+            if fragment is not None:
+                # Serialise the caller's request, and append the meta to it
+                request = {k: v for k, v in self.request.items() if k != 'meta'}
+                serialised = get_codec().dumps(request)
+                return (serialised[:-1] + ',' if request else '{') + \
+                    '"meta":{"sdk":' + fragment + '}}'
+
+        return get_codec().dumps(self.request)
 
     def generate_signature(self) -> str:
+        cache = self.__signature_cache
+        cache_key = self._signature_cache_key() if cache is not None else None
+        if cache is not None and cache_key is not None:
+            signature = cache.get(cache_key)
+            if signature is not None:
+                return signature
 
         vals = []
 
@@ -142,51 +557,85 @@ class Init(object):
         if self.action is not None:
             vals.append(self.action)
 
-        return self.hash_list(vals)
+        signature = self.hash_list(vals)
+        if cache is not None and cache_key is not None:
+            cache.set(cache_key, signature, self.security.get('expires'))
+        return signature
+
+    def _signature_cache_key(self) -> Optional[bytes]:
+        # Identifies what is signed without serialising or hashing the
+        # request, so only requests that are not signed, or are rendered
+        # from a RequestTemplate with scalar values, can be cached. A digest,
+        # so that the cache does not hold the secret.
+        request: Any = None
+        if self.sign_request_data and self.request is not None:
+            if not isinstance(self.request, PreparedRequest):
+                return None
+            values = []
+            for name, value in sorted(self.request.placeholder_values.items()):
+                # The type, as e.g. 1 and True are equal but serialise apart
+                if type(value) not in _SCALAR_TYPES:
+                    return None
+                values.append((name, type(value).__name__, value))
+            sdk_meta = self.request['meta']['sdk'] if self.is_telemetry_enabled() else None
+            request = (self.request.template._marker, tuple(values), sdk_meta)
+
+        security = [self.security[key] for key in self.security_keys if key in self.security]
+        return hashlib.sha256(repr(
+            (self.secret, security, request, self.action)).encode('utf-8')).digest()
 
     def validate(self) -> None:
         # Parse the security packet if the user provided it as a string
-        if isinstance(self.security, str):
-            self.security = json.loads(self.security)
+        security = self.security
+        if isinstance(security, str):
+            security = self.security = json.loads(security)
 
-        # Parse the request packet if the user provided it as a string
-        self.request_passed_as_string = False
-        if isinstance(self.request, str):
-            self.request = json.loads(self.request)
-            self.request_passed_as_string = True
+        self.parse_request()
+        self._validate_security(self.service, security, self.secret, self.action)
+
+        # Add timestamp if missing
+        if 'timestamp' not in security:
+            security['timestamp'] = format_utc_time()
 
+    @classmethod
+    def _validate_security(
+            cls, service: str, security: Dict[str, Any], secret: str,
+            action: Optional[str]) -> None:
         # Validate field lengths and types
-        if len(self.service) == 0:
+        if len(service) == 0:
             raise ValidationException(
                 "The `service` argument wasn't found or was empty")
 
-        if len(self.secret) == 0:
+        if len(secret) == 0:
             raise ValidationException(
                 "The `secret` argument wasn't found or  was empty")
 
-        if self.action is not None and not isinstance(self.action, str):
+        if action is not None and not isinstance(action, str):
             raise ValidationException("The action parameter must be a string")
 
         # Check that service is valid
-        if self.service not in self.services:
+        if service not in cls.services:
             raise ValidationException(
-                "Service not valid: {}".format(self.service))
+                "Service not valid: {}".format(service))
 
         # Check that security keys are valid
-        for k in self.security.keys():
-            if k not in self.security_keys:
+        for k in security:
+            if k not in cls.security_keys:
                 raise ValidationException(
                     "Invalid key found in the security packet: {}".format(k))
 
-        # Add timestamp if missing
-        if 'timestamp' not in self.security:
-            self.security['timestamp'] = format_utc_time()
-
         # Special case for Questions API
-        if self.service == 'questions' and \
-                'user_id' not in self.security:
+        if service == 'questions' and \
+                'user_id' not in security:
             raise ValidationException("questions API requires a user id")
 
+    def parse_request(self) -> None:
+        # Parse the request packet if the user provided it as a string
+        self.request_passed_as_string = False
+        if isinstance(self.request, str):
+            self.request = json.loads(self.request)
+            self.request_passed_as_string = True
+
     def set_service_options(self) -> None:
         if self.service == 'questions':
             self.sign_request_data = False
@@ -203,24 +652,30 @@ class Init(object):
                 else:
                     domain = 'assess.learnosity.com'
 
-                self.request['questionsApiActivity'] = {
-                    'consumer_key': self.security['consumer_key'],
-                    'timestamp': self.security['timestamp'],
-                    'user_id': self.security['user_id'],
-                    'signature': self.hash_list({
+                if isinstance(questionsApi, ActivityTemplate):
+                    activity = questionsApi.sign(
+                        self.signer, self.security['consumer_key'], domain,
+                        self.security['timestamp'], self.security['user_id'])
+                else:
+                    activity = {
                         'consumer_key': self.security['consumer_key'],
-                        'domain': domain,
                         'timestamp': self.security['timestamp'],
                         'user_id': self.security['user_id'],
-                        'secret': self.secret
-                    }.values())
-                }
-
-                for key in [ 'consumer_key', 'domain', 'timestamp', 'user_id', 'signature']:
-                    if key in questionsApi.keys():
-                        del questionsApi[key]
-
-                self.request['questionsApiActivity'].update(questionsApi)
+                        'signature': self.hash_list({
+                            'consumer_key': self.security['consumer_key'],
+                            'domain': domain,
+                            'timestamp': self.security['timestamp'],
+                            'user_id': self.security['user_id'],
+                            'secret': self.secret
+                        }.values())
+                    }
+
+                    # Leave the caller's questionsApiActivity as it is
+                    activity.update(
+                        (key, value) for key, value in questionsApi.items()
+                        if key not in ActivityTemplate.signed_keys)
+
+                self.request['questionsApiActivity'] = activity
 
         elif self.service == 'items' or self.service == 'reports':
             if self.request is not None and ('user_id' not in self.security and 'user_id' in self.request):
@@ -230,27 +685,37 @@ class Init(object):
             self.sign_request_data = False
             hashed_users = {}
             users = self.request.get('users', []) if self.request is not None else []
-            for user in users:
-                concat = "{}{}".format(user, self.secret)
-                hashed_users[user] = hashlib.sha256(concat.encode('utf-8')).hexdigest()
+            cache = self.__user_hash_cache
+            if cache is not None:
+                hashed_users = cache.hash_users(users, self.secret)
+            else:
+                for user in users:
+                    concat = "{}{}".format(user, self.secret)
+                    hashed_users[user] = hashlib.sha256(concat.encode('utf-8')).hexdigest()
 
             if len(hashed_users) > 0:
                 self.security['users'] = hashed_users
 
     def hash_list(self, l: Iterable[Any]) -> str:
         "Hash a list by concatenating values with an underscore"
-        concatValues = "_".join(l)
-        signature =  hmac.new(bytes(str(self.secret),'utf_8'), msg = bytes(str(concatValues) , 'utf-8'), digestmod = hashlib.sha256).hexdigest()
-        return '$02$' + signature
+        return self.signer.hash_list(l)
 
-    def add_telemetry_data(self) -> None:
+    def add_telemetry_data(self, sdk_meta: Optional[Dict[str, str]] = None) -> None:
         if self.request is not None and self.__telemetry_enabled:
+            if sdk_meta is None:
+                sdk_meta = self.get_sdk_meta()
+            else:
+                sdk_meta = dict(sdk_meta)
             if 'meta' in self.request:
-                self.request['meta']['sdk'] = self.get_sdk_meta()
+                # Overlay the caller's meta rather than modifying it
+                meta = dict(self.request['meta'])
+                meta['sdk'] = sdk_meta
+                self.request['meta'] = meta
             else:
                 self.request['meta'] = {
-                    'sdk': self.get_sdk_meta()
+                    'sdk': sdk_meta
                 }
+                self._sdk_meta_appended = True
 
     """
     We use telemetry to enable better support and feature planning. It is
@@ -260,7 +725,133 @@ class Init(object):
     @classmethod
     def disable_telemetry(cls) -> None:
         cls.__telemetry_enabled = False
+        Init.__sdk_meta = None
 
     @classmethod
     def enable_telemetry(cls) -> None:
         cls.__telemetry_enabled = True
+        Init.__sdk_meta = None
+
+    @classmethod
+    def enable_signature_cache(cls, maxsize: int = 1024,
+                               clock: Callable[[], float] = time.time) -> None:
+        """
+        Cache signatures, so that signing the same security fields, request
+        and action again within the same minute is a lookup. See
+        `SignatureCache`.
+
+        The request is not serialised or hashed to look up its signature, so
+        only requests that are not signed (e.g. for Questions API) or that
+        are rendered from a `RequestTemplate`, with string, number, boolean
+        or None placeholder values, are cached. Other requests are signed as
+        usual.
+
+        Args:
+            maxsize (int): The maximum number of signatures cached
+            clock (callable): Returns the current time, in seconds since the
+                epoch
+        """
+        cls.__signature_cache = SignatureCache(maxsize, clock)
+
+    @classmethod
+    def disable_signature_cache(cls) -> None:
+        cls.__signature_cache = None
+
+    @classmethod
+    def enable_user_hash_cache(cls, maxsize: int = 100000,
+                               executor: Optional['Executor'] = None,
+                               batch_size: int = 5000) -> None:
+        """
+        Cache the hashes of Events API user ids, and optionally hash large
+        lists of users on an executor. See `UserHashCache`.
+
+        Args:
+            maxsize (int): The maximum number of hashes cached
+            executor (Executor): Hashes batches of user ids, if there are
+                several. This is rarely faster, see `UserHashCache`.
+            batch_size (int): The number of user ids per batch
+        """
+        cls.__user_hash_cache = UserHashCache(maxsize, executor, batch_size)
+
+    @classmethod
+    def disable_user_hash_cache(cls) -> None:
+        cls.__user_hash_cache = None
+
+
+def _generate_chunk(
+        service: str, security: Dict[str, Any], secret: str,
+        requests: List[Optional[Union[Dict[str, Any], str]]],
+        action: Optional[str], encode: bool,
+        sdk_meta: Optional[Dict[str, str]],
+        telemetry_enabled: bool) -> List[Union[str, Dict[str, Any]]]:
+    # Runs in a worker process of Init.generate_many
+    signer = Signer(secret)
+    return [
+        Init._trusted(service, security, signer, request, action,
+                      sdk_meta, telemetry_enabled).generate(encode)
+        for request in requests]
+
+
+class ValidatedSecurity(object):
+    """
+    A service, secret and security packet validated once, to sign many
+    requests with
+
+    Each Init made from it is trusted, so is not validated again, and reuses
+    the keyed HMAC of the secret:
+
+        validated = ValidatedSecurity('items', security, secret)
+        for request in requests:
+            output = validated.generate(request)
+
+    If the security packet has no timestamp, each Init gets the current time,
+    as usual. The security packet is copied, so later changes to the
+    caller's dict are not seen.
+    """
+
+    def __init__(
+            self, service: str, security: Union[Dict[str, Any], str],
+            secret: Union[str, Signer], action: Optional[str] = None) -> None:
+        """
+        Args:
+            service (string): The service, e.g. 'items'
+            security (dict|string): The security packet, or its JSON
+            secret (string|Signer): The consumer secret key, or a Signer
+            action (string): The action, if any
+
+        Raises:
+            ValidationException: If any of them are invalid
+        """
+        if isinstance(security, str):
+            security = json.loads(security)
+        self.service = service
+        self.security = cast(Dict[str, Any], security).copy()
+        self.signer = secret if isinstance(secret, Signer) else Signer(secret)
+        self.action = action
+
+        Init._validate_security(service, self.security, self.signer.secret, action)
+
+    def __repr__(self) -> str:
+        return '<ValidatedSecurity {}>'.format(self.service)
+
+    def init(self, request: Optional[Union[Dict[str, Any], str]] = None,
+             lazy: bool = False) -> Init:
+        """
+        Make a trusted Init for a request
+
+        Args:
+            request (dict|string): The request packet
+            lazy (bool): See `Init`
+
+        Returns:
+            Init: The Init
+        """
+        return Init(self.service, self.security, self.signer, request,
+                    self.action, lazy=lazy, trusted=True)
+
+    def generate(self, request: Optional[Union[Dict[str, Any], str]] = None,
+                 encode: bool = True) -> Union[str, Dict[str, Any]]:
+        """
+        Generate the signed packet for a request, as `Init.generate` does
+        """
+        return self.init(request).generate(encode)
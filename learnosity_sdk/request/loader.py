@@ -0,0 +1,195 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+from learnosity_sdk.request.dataapi import DataApi
+from learnosity_sdk.request.signer import Signer
+
+
+class DataLoader(object):
+    """
+    Batch individual lookups by identifier into single Data API requests
+
+    Calls to `load` made within `window` seconds of each other, from any
+    thread, are collected and sent as one request with all their
+    identifiers in `key` (e.g. `references`), up to `max_batch_size`
+    identifiers per request. Each call gets a future, resolved with the
+    result whose `id_field` matches its identifier, or None if there is no
+    such result.
+
+    `key` and `max_batch_size` default to the values in
+    `DataApi.chunk_limits` for the endpoint. `id_field` defaults to `key`
+    without its plural `s`, e.g. `reference` for `references`. Endpoints
+    that return `data` as an object keyed by identifier, such as
+    `/itembank/questions`, are matched on the keys instead, and each call is
+    resolved with the value under its identifier.
+    """
+
+    def __init__(self, client: DataApi, endpoint: str,
+                 security_packet: Dict[str, str], secret: Union[str, Signer],
+                 request_packet: Dict[str, Any] = {}, action: str = 'get',
+                 key: Optional[str] = None, id_field: Optional[str] = None,
+                 max_batch_size: Optional[int] = None, window: float = 0.005,
+                 group: bool = False, max_workers: int = 4) -> None:
+        """
+        Args:
+            client (DataApi): The client used to send requests
+            endpoint (string): The full url to the endpoint
+            security_packet (dict): The security object
+            secret (string|Signer): The consumer secret key, or a Signer
+            request_packet (dict): Additional request parameters sent with
+                every batch
+            action (string): 'get', etc.
+            key (string): The request parameter holding the identifiers
+            id_field (string): The field of a result holding its identifier
+            max_batch_size (int): The maximum number of identifiers per
+                request
+            window (float): How long to wait for more calls before sending a
+                batch, in seconds
+            group (bool): Whether to resolve each call with the list of all
+                matching results, rather than a single result
+            max_workers (int): The maximum number of batches in flight
+        """
+        limit = client.chunk_limits.get(client._endpoint_path(endpoint))
+        if key is None or max_batch_size is None:
+            if limit is None:
+                raise ValueError(
+                    'No chunk limit known for endpoint: {}'.format(endpoint))
+            key = limit[0] if key is None else key
+            max_batch_size = limit[1] if max_batch_size is None else max_batch_size
+        if id_field is None:
+            id_field = key[:-1] if key.endswith('s') else key
+
+        self.client = client
+        self.endpoint = endpoint
+        self.security_packet = security_packet
+        self.secret = secret
+        self.request_packet = request_packet
+        self.action = action
+        self.key = key
+        self.id_field = id_field
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.group = group
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._pending: Dict[Any, List['Future[Any]']] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='learnosity-loader')
+
+    def __enter__(self) -> 'DataLoader':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def load(self, identifier: Any) -> 'Future[Any]':
+        """
+        Request the result for an identifier, as part of the next batch
+
+        Args:
+            identifier: The identifier, e.g. an item reference
+
+        Returns:
+            Future: Resolved with the matching result, or None
+
+        Raises:
+            RuntimeError: If the loader is closed
+        """
+        future: 'Future[Any]' = Future()
+        batch = None
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('cannot load after the loader is closed')
+            self._pending.setdefault(identifier, []).append(future)
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if batch is not None:
+            self._submit(batch)
+        return future
+
+    def load_many(self, identifiers: Iterable[Any]) -> List['Future[Any]']:
+        """
+        Request the results for several identifiers
+
+        Returns:
+            list: A future per identifier, see `load`
+        """
+        return [self.load(identifier) for identifier in identifiers]
+
+    def flush(self) -> None:
+        "Send the pending batch now, without waiting for the window to end"
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._submit(batch)
+
+    def close(self) -> None:
+        "Send the pending batch, and wait for all batches to complete"
+        with self._lock:
+            self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, batch: Dict[Any, List['Future[Any]']]) -> None:
+        try:
+            self._executor.submit(self._dispatch, batch)
+        except RuntimeError as e:
+            # The executor was shut down, so the batch will never be sent
+            self._fail(batch, e)
+
+    def _take_batch(self) -> Dict[Any, List['Future[Any]']]:
+        # Called with the lock held
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _dispatch(self, batch: Dict[Any, List['Future[Any]']]) -> None:
+        request_packet = dict(self.request_packet)
+        request_packet[self.key] = list(batch)
+
+        try:
+            matches: Dict[Any, List[Any]] = {}
+            for page in self.client.request_iter(
+                    self.endpoint, self.security_packet, self.secret,
+                    request_packet, self.action):
+                data = page['data']
+                if isinstance(data, dict):
+                    # Keyed by identifier
+                    results = [(identifier, value) for identifier, value in data.items()]
+                else:
+                    results = [(result.get(self.id_field), result) for result in data]
+                for identifier, result in results:
+                    if identifier in batch:
+                        matches.setdefault(identifier, []).append(result)
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        for identifier, futures in batch.items():
+            results = matches.get(identifier, [])
+            if self.group:
+                value: Any = results
+            else:
+                value = results[0] if results else None
+            for future in futures:
+                future.set_result(value)
+
+    @staticmethod
+    def _fail(batch: Dict[Any, List['Future[Any]']], error: BaseException) -> None:
+        for futures in batch.values():
+            for future in futures:
+                future.set_exception(error)
@@ -0,0 +1,184 @@
+import datetime
+import email.utils
+import random
+import threading
+import time
+from typing import Callable, Collection, Dict, Optional
+
+from requests import Response
+
+
+class _ConsumerState(object):
+    "Concurrency state for a single consumer key"
+
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        # The number of times the limit was decreased
+        self.decreases = 0
+        self.cond = threading.Condition()
+
+
+class RateLimitController(object):
+    """
+    Retry throttled Data API requests and adapt concurrency to the server
+
+    A single controller can be shared by several `DataApi` clients, and
+    applies to every request they send, including those made by
+    `request_iter`, `results_iter`, `results_iter_chunked` and `BulkWriter`.
+
+    Responses with a status in `retry_statuses` are retried up to
+    `max_retries` times. The delay is the `Retry-After` header if there is
+    one, however long, and otherwise backs off exponentially from
+    `backoff_base` seconds, with full jitter, up to `backoff_max` seconds.
+
+    The number of requests in flight is limited per consumer key, and
+    adjusted AIMD-style: the limit grows by `increase` over each window of
+    `limit` successful requests (roughly one per round trip), and is
+    multiplied by `decrease_factor` on a throttled response, within
+    `min_limit` and `max_limit`. It is decreased at most once per round
+    trip: throttled responses to requests sent before the last decrease do
+    not decrease it again, so a burst of them only halves the limit once.
+    """
+
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5,
+                 backoff_max: float = 60.0, initial_limit: float = 4,
+                 min_limit: float = 1, max_limit: float = 64,
+                 increase: float = 1, decrease_factor: float = 0.5,
+                 retry_statuses: Collection[int] = (429, 500, 502, 503, 504),
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                'Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be between 0 and 1')
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.retry_statuses = frozenset(retry_statuses)
+        self.sleep = sleep
+
+        self._consumers: Dict[str, _ConsumerState] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, consumer: str) -> float:
+        "The current concurrency limit for a consumer key"
+        return self._state(consumer).limit
+
+    def call(self, consumer: str, send: Callable[[], Response]) -> Response:
+        """
+        Send a request, waiting for a free slot and retrying if throttled
+
+        Args:
+            consumer (string): The consumer key the request is sent for
+            send (callable): Sends the request and returns the response. It
+                is called again for each retry, so that the request can be
+                re-signed.
+
+        Returns:
+            requests.Response: The last response received
+        """
+        state = self._state(consumer)
+        attempt = 0
+
+        while True:
+            decreases = self._acquire(state)
+            try:
+                res = send()
+            finally:
+                self._release(state)
+
+            throttled = res.status_code in self.retry_statuses
+            self._adjust(state, throttled, decreases)
+
+            if not throttled or attempt >= self.max_retries:
+                return res
+
+            delay = self.retry_delay(res, attempt)
+            # Return the connection to the pool, as a streamed body is unread
+            res.close()
+            self.sleep(delay)
+            attempt += 1
+
+    def retry_delay(self, res: Response, attempt: int) -> float:
+        """
+        The number of seconds to wait before retrying a throttled response
+
+        Args:
+            res (requests.Response): The throttled response
+            attempt (int): The number of retries already made
+
+        Returns:
+            float: The delay in seconds
+        """
+        retry_after = self._parse_retry_after(res.headers.get('Retry-After'))
+        if retry_after is not None:
+            # Not capped, as retrying sooner would likely be throttled again
+            return retry_after
+
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        "Parse a Retry-After header, given either in seconds or as a date"
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (date - now).total_seconds())
+
+    def _state(self, consumer: str) -> _ConsumerState:
+        with self._lock:
+            state = self._consumers.get(consumer)
+            if state is None:
+                state = _ConsumerState(self.initial_limit)
+                self._consumers[consumer] = state
+            return state
+
+    def _acquire(self, state: _ConsumerState) -> int:
+        # Returns the number of decreases so far, to tell whether the
+        # response comes from before or after the next one
+        with state.cond:
+            while state.in_flight >= int(state.limit):
+                state.cond.wait()
+            state.in_flight += 1
+            return state.decreases
+
+    def _release(self, state: _ConsumerState) -> None:
+        with state.cond:
+            state.in_flight -= 1
+            state.cond.notify()
+
+    def _adjust(self, state: _ConsumerState, throttled: bool,
+                decreases: int) -> None:
+        with state.cond:
+            if throttled:
+                # Once per round trip, for requests sent since the last one
+                if decreases == state.decreases:
+                    state.limit = max(self.min_limit,
+                                      state.limit * self.decrease_factor)
+                    state.decreases += 1
+            else:
+                previous = int(state.limit)
+                state.limit = min(self.max_limit,
+                                  state.limit + self.increase / state.limit)
+                if int(state.limit) > previous:
+                    state.cond.notify_all()
@@ -0,0 +1,207 @@
+import collections
+import hashlib
+import hmac
+import itertools
+import threading
+import time
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Optional, OrderedDict,
+    Tuple)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+class Signer(object):
+    """
+    Sign values with a consumer secret
+
+    The HMAC is keyed once, when the signer is created, and the keyed state
+    is copied for each signature. Build a signer once per consumer secret
+    and pass it to `Init` or `DataApi` in place of the secret, to avoid
+    re-deriving the key for every request.
+    """
+
+    def __init__(self, secret: str) -> None:
+        self.secret = secret
+        self._hmac = hmac.new(bytes(str(secret), 'utf_8'),
+                              digestmod=hashlib.sha256)
+
+    def __repr__(self) -> str:
+        # Never expose the secret
+        return '<Signer>'
+
+    def hash_list(self, l: Iterable[Any]) -> str:
+        "Hash a list by concatenating values with an underscore"
+        concatValues = "_".join(l)
+        return self.hash_bytes(bytes(str(concatValues), 'utf-8'))
+
+    def with_prefix(self, l: Iterable[Any]) -> 'Signer':
+        """
+        Return a signer for lists that start with the values of `l`
+
+        The prefix is hashed once, so `signer.with_prefix(a).hash_list(b)`
+        is `signer.hash_list(a + b)`, at the cost of hashing only `b`.
+        """
+        signer = Signer.__new__(Signer)
+        signer.secret = self.secret
+        signer._hmac = self._hmac.copy()
+        signer._hmac.update(bytes(str("_".join(l) + "_"), 'utf-8'))
+        return signer
+
+    def hash_bytes(self, msg: bytes) -> str:
+        "Hash a message that is already encoded"
+        h = self._hmac.copy()
+        h.update(msg)
+        return '$02$' + h.hexdigest()
+
+    def hash_stream(self, chunks: Iterable[str]) -> str:
+        "Hash the concatenation of chunks of text, without joining them"
+        h = self._hmac.copy()
+        for chunk in chunks:
+            h.update(chunk.encode('utf-8'))
+        return '$02$' + h.hexdigest()
+
+
+class SignatureCache(object):
+    """
+    Cache signatures, least recently used first out
+
+    A signature only depends on what is signed, so signing the same security
+    fields, request and action again within a minute gives the same
+    signature. Entries expire when the minute they were cached in ends, as
+    the next request would have a new timestamp, or when the `expires` time
+    of their security packet has passed.
+    """
+
+    def __init__(self, maxsize: int = 1024,
+                 clock: Callable[[], float] = time.time) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[int, Optional[str], str]] = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        "Return the signature cached for a key, if any and not expired"
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            minute, expires, signature = entry
+            if minute != int(now // 60) or (
+                    expires is not None and
+                    expires <= time.strftime('%Y%m%d-%H%M', time.gmtime(now))):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return signature
+
+    def set(self, key: Hashable, signature: str,
+            expires: Optional[str] = None) -> None:
+        """
+        Cache a signature
+
+        Args:
+            key: Identifies what was signed
+            signature (string): The signature
+            expires (string): The `expires` field of the security packet, if
+                any
+        """
+        minute = int(self.clock() // 60)
+        with self._lock:
+            self._entries[key] = (minute, expires, signature)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        "Remove all entries"
+        with self._lock:
+            self._entries.clear()
+
+
+def hash_users(users: Iterable[Any], secret: str) -> List[str]:
+    "Hash Events API user ids with a consumer secret"
+    return [
+        hashlib.sha256("{}{}".format(user, secret).encode('utf-8')).hexdigest()
+        for user in users]
+
+
+class UserHashCache(object):
+    """
+    Cache the hashes of Events API user ids, least recently used first out
+
+    Hashes are cached per secret. User ids that are not cached are hashed in
+    batches of `batch_size`, which are spread over `executor` if one is given
+    and there is more than one batch.
+
+    Hashing a short user id costs less than sending it to another thread or
+    process. For 20,000 to 1,000,000 ids, neither a `ThreadPoolExecutor` nor
+    a `ProcessPoolExecutor` was faster than hashing in the calling thread,
+    so leave `executor` unset unless measurements on your own hardware and
+    user ids show otherwise.
+    """
+
+    def __init__(self, maxsize: int = 100000, executor: Optional['Executor'] = None,
+                 batch_size: int = 5000) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        self.maxsize = maxsize
+        self.executor = executor
+        self.batch_size = batch_size
+        self._entries: OrderedDict[Tuple[str, Any], str] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def hash_users(self, users: Iterable[Any], secret: str) -> Dict[Any, str]:
+        """
+        Hash user ids with a consumer secret
+
+        Returns:
+            dict: The hash of each user id, in the order of `users`
+        """
+        users = list(users)
+        hashed: Dict[Any, str] = {}
+        missing: Dict[Any, None] = {}
+        with self._lock:
+            for user in users:
+                key = (secret, user)
+                user_hash = self._entries.get(key)
+                if user_hash is None:
+                    missing[user] = None
+                else:
+                    self._entries.move_to_end(key)
+                    hashed[user] = user_hash
+
+        if missing:
+            pending = list(missing)
+            batches = [
+                pending[i:i + self.batch_size]
+                for i in range(0, len(pending), self.batch_size)]
+            if self.executor is not None and len(batches) > 1:
+                hashes = itertools.chain.from_iterable(self.executor.map(
+                    hash_users, batches, itertools.repeat(secret)))
+            else:
+                hashes = itertools.chain.from_iterable(
+                    hash_users(batch, secret) for batch in batches)
+
+            computed = dict(zip(missing, hashes))
+            hashed.update(computed)
+            with self._lock:
+                for user, user_hash in computed.items():
+                    self._entries[(secret, user)] = user_hash
+                    self._entries.move_to_end((secret, user))
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        return {user: hashed[user] for user in users}
+
+    def clear(self) -> None:
+        "Remove all entries"
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,251 @@
+import collections
+import json
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, OrderedDict, Tuple
+
+from learnosity_sdk.exceptions import ValidationException
+from learnosity_sdk.request.signer import Signer
+from learnosity_sdk.utils.jsoncodec import get_codec
+
+
+class Placeholder(object):
+    """
+    Marks a value of a `RequestTemplate` that is filled in per request
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return 'Placeholder({!r})'.format(self.name)
+
+
+# Stands for the telemetry meta added by Init
+_SDK_META = Placeholder('meta.sdk')
+
+
+class PreparedRequest(Dict[str, Any]):
+    """
+    A request rendered from a `RequestTemplate`
+
+    This is a dict, and can be passed to `Init` in place of the request. Init
+    then builds the request string from the template's pre-serialised
+    fragments instead of serialising the whole request. It must not be
+    modified.
+    """
+
+    def __init__(self, data: Dict[str, Any], template: 'RequestTemplate',
+                 values: Dict[str, Any]) -> None:
+        super().__init__(data)
+        self.template = template
+        self.placeholder_values = values
+
+    def copy(self) -> 'PreparedRequest':
+        return PreparedRequest(self, self.template, self.placeholder_values)
+
+    def request_string(self, sdk_meta: Optional[Dict[str, str]] = None,
+                       sdk_meta_json: Optional[str] = None) -> str:
+        """
+        Serialise the request, as `Init.generate_request_string` does
+
+        Args:
+            sdk_meta (dict): The telemetry meta added by Init, if any
+            sdk_meta_json (string): The telemetry meta, already serialised
+        """
+        return self.template.serialise(self.placeholder_values, sdk_meta, sdk_meta_json)
+
+
+class RequestTemplate(object):
+    """
+    A request whose invariant parts are serialised once
+
+    Mark the values that change per request with a `Placeholder`, and call
+    `render` with the values for each request:
+
+        template = RequestTemplate({
+            'activity_id': 'exam',
+            'user_id': Placeholder('user_id'),
+            'session_id': Placeholder('session_id'),
+            'items': items,
+        })
+        request = template.render(user_id=user_id, session_id=session_id)
+        Init('items', security, secret, request)
+
+    The request string, and so the signature, are the same as for the
+    equivalent plain dict.
+    """
+
+    def __init__(self, request: Dict[str, Any]) -> None:
+        self.request = request
+        self.names = set(self._placeholders(request))
+        self._marker = uuid.uuid4().hex
+        self._compiled: Dict[bool, Tuple[List[str], List[Placeholder]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _placeholders(cls, value: Any) -> List[str]:
+        if isinstance(value, Placeholder):
+            return [value.name]
+        if isinstance(value, dict):
+            return [n for v in value.values() for n in cls._placeholders(v)]
+        if isinstance(value, list):
+            return [n for v in value for n in cls._placeholders(v)]
+        return []
+
+    def render(self, **values: Any) -> PreparedRequest:
+        """
+        Fill in the placeholders
+
+        Args:
+            values: A value for each placeholder, by name
+
+        Returns:
+            PreparedRequest: The request
+        """
+        missing = self.names.difference(values)
+        if missing:
+            raise ValidationException(
+                "Missing values for placeholders: {}".format(', '.join(sorted(missing))))
+
+        data = self._substitute(self.request, values)
+        return PreparedRequest(data, self, values)
+
+    @classmethod
+    def _substitute(cls, value: Any, values: Dict[str, Any]) -> Any:
+        # Copy only the containers holding placeholders
+        if isinstance(value, Placeholder):
+            return values[value.name]
+        if isinstance(value, dict):
+            items = {k: cls._substitute(v, values) for k, v in value.items()}
+            if any(items[k] is not v for k, v in value.items()):
+                return items
+        if isinstance(value, list):
+            entries = [cls._substitute(v, values) for v in value]
+            if any(e is not v for e, v in zip(entries, value)):
+                return entries
+        return value
+
+    def serialise(self, values: Dict[str, Any],
+                  sdk_meta: Optional[Dict[str, str]] = None,
+                  sdk_meta_json: Optional[str] = None) -> str:
+        """
+        Serialise a request by splicing its values into the template
+
+        Args:
+            values (dict): A value for each placeholder, by name
+            sdk_meta (dict): The telemetry meta added by Init, if any
+            sdk_meta_json (string): The telemetry meta, already serialised
+
+        Returns:
+            string: The request, serialised as `Init.generate_request_string`
+                does
+        """
+        fragments, placeholders = self._compile(sdk_meta is not None)
+        codec = get_codec()
+        parts = [fragments[0]]
+        for placeholder, fragment in zip(placeholders, fragments[1:]):
+            if placeholder is _SDK_META:
+                parts.append(codec.dumps(sdk_meta) if sdk_meta_json is None else sdk_meta_json)
+            else:
+                parts.append(codec.dumps(values[placeholder.name]))
+            parts.append(fragment)
+        return ''.join(parts)
+
+    def _compile(self, telemetry: bool) -> Tuple[List[str], List[Placeholder]]:
+        compiled = self._compiled.get(telemetry)
+        if compiled is not None:
+            return compiled
+
+        with self._lock:
+            request = dict(self.request)
+            if telemetry:
+                # Where Init.add_telemetry_data puts the meta
+                if 'meta' in request:
+                    request['meta'] = dict(request['meta'])
+                    request['meta']['sdk'] = _SDK_META
+                else:
+                    request['meta'] = {'sdk': _SDK_META}
+
+            placeholders: List[Placeholder] = []
+            marked = self._mark(request, placeholders)
+            serialised = get_codec().dumps(marked)
+            fragments = []
+            for i in range(len(placeholders)):
+                marker = json.dumps(self._marker_string(i))
+                fragment, serialised = serialised.split(marker, 1)
+                fragments.append(fragment)
+            fragments.append(serialised)
+
+            compiled = (fragments, placeholders)
+            self._compiled[telemetry] = compiled
+            return compiled
+
+    def _mark(self, value: Any, placeholders: List[Placeholder]) -> Any:
+        # Replace each placeholder with a unique string, in serialisation order
+        if isinstance(value, Placeholder):
+            placeholders.append(value)
+            return self._marker_string(len(placeholders) - 1)
+        if isinstance(value, dict):
+            return {k: self._mark(v, placeholders) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._mark(v, placeholders) for v in value]
+        return value
+
+    def _marker_string(self, index: int) -> str:
+        return 'placeholder:{}:{}'.format(self._marker, index)
+
+
+class ActivityTemplate(Dict[str, Any]):
+    """
+    The `questionsApiActivity` of Assess API requests, prepared once for
+    many users
+
+    This is a dict, to use in place of the `questionsApiActivity` of the
+    request. When Init re-signs it, the part that does not change per user is
+    reused rather than rebuilt, and the Questions API signature is computed
+    from the hashed consumer key, domain and timestamp, so only the user id
+    is hashed per user. The question list is shared, never copied.
+    """
+
+    # The keys set by Init when re-signing the activity
+    signed_keys = ('consumer_key', 'domain', 'timestamp', 'user_id', 'signature')
+
+    # The number of prefix signers kept, e.g. for timestamps and secrets
+    max_signers = 16
+
+    def __init__(self, activity: Dict[str, Any]) -> None:
+        super().__init__(activity)
+        self.static = {k: v for k, v in activity.items() if k not in self.signed_keys}
+        self._signers: OrderedDict[Tuple[str, str, str, str], Signer] = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def sign(self, signer: Signer, consumer_key: str, domain: str,
+             timestamp: str, user_id: str) -> Dict[str, Any]:
+        """
+        Build the signed activity for a user
+
+        Returns:
+            dict: The activity, as Init builds it
+        """
+        key = (signer.secret, consumer_key, domain, timestamp)
+        with self._lock:
+            prefixed = self._signers.get(key)
+            if prefixed is not None:
+                self._signers.move_to_end(key)
+        if prefixed is None:
+            prefixed = signer.with_prefix([consumer_key, domain, timestamp])
+            with self._lock:
+                self._signers[key] = prefixed
+                while len(self._signers) > self.max_signers:
+                    self._signers.popitem(last=False)
+
+        activity = {
+            'consumer_key': consumer_key,
+            'timestamp': timestamp,
+            'user_id': user_id,
+            'signature': prefixed.hash_list([user_id, signer.secret]),
+        }
+        activity.update(self.static)
+        return activity
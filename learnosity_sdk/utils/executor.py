@@ -0,0 +1,57 @@
+import collections
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def bounded_map(func: Callable[[T], R], iterable: Iterable[T],
+                max_workers: int, preserve_order: bool = False) -> Iterator[R]:
+    """
+    Apply `func` to each value of `iterable` on a pool of threads
+
+    At most `max_workers` calls are in flight, and `iterable` is only consumed
+    as calls complete, so it can be arbitrarily large. Results are yielded as
+    calls complete, or in the order of `iterable` if `preserve_order` is set.
+
+    If a call raises, the exception is re-raised to the consumer. Calls that
+    have not started yet are cancelled when the iterator is closed.
+
+    Args:
+        func (callable): The function to call
+        iterable (iterable): The arguments to call `func` with
+        max_workers (int): The maximum number of calls in flight
+        preserve_order (bool): Whether to yield results in input order
+
+    Yields:
+        The result of each call
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be at least 1')
+
+    values = iter(iterable)
+    executor = ThreadPoolExecutor(max_workers=max_workers,
+                                  thread_name_prefix='learnosity-sdk')
+    pending: Deque['Future[R]'] = collections.deque()
+    try:
+        for value in itertools.islice(values, max_workers):
+            pending.append(executor.submit(func, value))
+
+        while pending:
+            if preserve_order:
+                completed = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                completed = [f for f in pending if f in done]
+                for future in completed:
+                    pending.remove(future)
+
+            for future in completed:
+                result = future.result()
+                for value in itertools.islice(values, 1):
+                    pending.append(executor.submit(func, value))
+                yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,127 @@
+import json
+import re
+from typing import Any, Match, Optional, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+
+
+class JsonCodec(object):
+    """
+    Encode and decode JSON with the standard library
+
+    `dumps` gives the canonical encoding used for signing: compact
+    separators, keys in insertion order and non-ASCII characters unescaped.
+    Other codecs must give exactly the same output, so that signatures do not
+    depend on the codec in use.
+    """
+
+    name = 'json'
+
+    def dumps(self, value: Any) -> str:
+        "Encode a value canonically"
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        "Decode a JSON document"
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Encode and decode JSON with orjson, if it is installed
+
+    orjson differs from the standard library in a few cases, which are
+    handled here so that `dumps` stays canonical:
+
+    - Floats are formatted differently (e.g. `1e16` for `1e+16`), so their
+      tokens are rewritten with Python's `repr`.
+    - NaN and infinities are encoded as `null`, and dicts with non-string
+      keys and integers beyond 64 bits are rejected. Any value with these is
+      encoded with the standard library instead.
+
+    orjson also encodes some values the standard library rejects, such as
+    UUIDs.
+
+    `loads` falls back to the standard library for documents orjson rejects,
+    such as those with NaN. orjson decodes integers beyond 64 bits as floats,
+    so documents that may have one, with a run of 19 or more digits, are also
+    decoded with the standard library.
+    """
+
+    name = 'orjson'
+
+    # A string, which is skipped, or a float
+    _FLOAT = re.compile(
+        rb'"[^"\\]*(?:\\.[^"\\]*)*"|-?\d+(?:\.\d+)?[eE][-+]?\d+|-?\d+\.\d+')
+    # Cheap checks for a possible float, searched for a literal first
+    _FRACTION_HINT = re.compile(rb'\.\d')
+    _EXPONENT_HINT = re.compile(rb'e-?\d')
+    # Maps every digit to 0, to find runs of digits without a regex, which
+    # would be slower than decoding
+    _DIGITS = bytes.maketrans(b'123456789', b'000000000')
+    _LONG_DIGITS = b'0' * 19
+
+    def __init__(self) -> None:
+        if not HAS_ORJSON:
+            raise ImportError('orjson is not installed')
+        # Leave what the standard library rejects to the standard library
+        self._options = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, value: Any) -> str:
+        try:
+            encoded = orjson.dumps(value, option=self._options)
+        except TypeError:
+            return super().dumps(value)
+
+        if b'null' in encoded:
+            # Possibly a NaN or infinity
+            return super().dumps(value)
+        if self._FRACTION_HINT.search(encoded) is not None or \
+                self._EXPONENT_HINT.search(encoded) is not None:
+            encoded = self._FLOAT.sub(self._format_float, encoded)
+        return encoded.decode('utf-8')
+
+    @staticmethod
+    def _format_float(match: Match[bytes]) -> bytes:
+        token = match.group()
+        if token.startswith(b'"'):
+            return token
+        return repr(float(token)).encode('ascii')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        encoded = data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else data
+        if self._LONG_DIGITS in encoded.translate(self._DIGITS):
+            # Possibly an integer beyond 64 bits
+            return super().loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+_codec: Optional[JsonCodec] = None
+
+
+def get_codec() -> JsonCodec:
+    """
+    Return the codec in use
+
+    This is the fastest codec installed, unless another was set with
+    `set_codec`.
+    """
+    global _codec
+    if _codec is None:
+        _codec = OrjsonCodec() if HAS_ORJSON else JsonCodec()
+    return _codec
+
+
+def set_codec(codec: Optional[JsonCodec]) -> None:
+    """
+    Set the codec to use, or None to go back to the default
+    """
+    global _codec
+    _codec = codec
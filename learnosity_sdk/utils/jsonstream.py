@@ -0,0 +1,271 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[ \t\n\r,\]}]')
+
+
+class PageParser(object):
+    """
+    Incrementally parse a Data API page, one element of `data` at a time
+
+    Feed the response body in chunks of bytes: each call to `feed` returns
+    the elements of the top-level `data` array that have been completed by
+    that chunk (or `{key: value}` for each member, if `data` is an object).
+    All other top-level members, such as `meta`, are decoded whole and made
+    available in `members` once complete.
+
+    Only the element currently being received is buffered, so memory use is
+    bounded by the size of one element rather than of the whole page.
+
+    Raises:
+        ValueError: Raised if the body is not a valid JSON object.
+    """
+
+    def __init__(self) -> None:
+        self.members: Dict[str, Any] = {}
+        self.count = 0
+
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key: Optional[str] = None
+        self._data_key: Optional[str] = None
+        self._data_closer = ''
+
+        # State of the scan of the value starting at `_value_start`
+        self._value_start = -1
+        self._scan_pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        "The `meta` member of the page, or an empty dict"
+        meta: Dict[str, Any] = self.members.get('meta', {})
+        return meta
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the body
+
+        Args:
+            chunk (bytes): The next chunk of the response body
+
+        Returns:
+            list: The elements of `data` completed by this chunk
+        """
+        # Drop what has already been parsed, keeping any partial value
+        keep = self._value_start if self._value_start >= 0 else self._pos
+        if keep > 0:
+            self._buf = self._buf[keep:]
+            self._pos -= keep
+            if self._value_start >= 0:
+                self._scan_pos -= keep
+                self._value_start = 0
+
+        self._buf += self._decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Finish parsing the body
+
+        Returns:
+            list: The elements of `data` still pending, if any
+
+        Raises:
+            ValueError: Raised if the body is incomplete.
+        """
+        self._buf += self._decoder.decode(b'', final=True)
+        results = self._parse(final=True)
+        if self._state != 'done':
+            raise ValueError('Incomplete JSON document')
+        return results
+
+    def _error(self, expected: str) -> ValueError:
+        return ValueError('Expecting {} at offset {}: {!r}'.format(
+            expected, self._pos, self._buf[self._pos:self._pos + 20]))
+
+    def _skip_whitespace(self) -> bool:
+        "Skip whitespace, returning True if there is more data to parse"
+        match = _WHITESPACE.match(self._buf, self._pos)
+        if match is not None:
+            self._pos = match.end()
+        return self._pos < len(self._buf)
+
+    def _scan(self, final: bool) -> Optional[List[Any]]:
+        """
+        Scan the value starting at the current position
+
+        Returns a one-element list holding the decoded value once it is
+        complete, or None if more data is needed.
+        """
+        buf = self._buf
+        if self._value_start < 0:
+            self._value_start = self._pos
+            self._scan_pos = self._pos
+            self._depth = 0
+            self._in_string = False
+            self._escape = False
+
+            if buf[self._pos] not in '"[{':
+                match = _SCALAR_END.search(buf, self._pos)
+                if match is None and not final:
+                    self._value_start = -1
+                    return None
+                return self._complete(len(buf) if match is None else match.start())
+
+        pos = self._scan_pos
+        while pos < len(buf):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return self._complete(pos)
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._complete(pos)
+
+        self._scan_pos = pos
+        return None
+
+    def _complete(self, end: int) -> List[Any]:
+        value = json.loads(self._buf[self._value_start:end])
+        self._value_start = -1
+        self._pos = end
+        return [value]
+
+    def _parse(self, final: bool) -> List[Any]:
+        results: List[Any] = []
+
+        while self._skip_whitespace():
+            char = self._buf[self._pos]
+            state = self._state
+
+            if state == 'start':
+                if char != '{':
+                    raise self._error('object')
+                self._pos += 1
+                self._state = 'first_key'
+
+            elif state in ('first_key', 'key'):
+                if char == '}' and state == 'first_key':
+                    self._pos += 1
+                    self._state = 'done'
+                    continue
+                if char != '"':
+                    raise self._error('property name')
+                scanned = self._scan(final)
+                if scanned is None:
+                    break
+                self._key = scanned[0]
+                self._state = 'colon'
+
+            elif state == 'colon':
+                if char != ':':
+                    raise self._error("':' delimiter")
+                self._pos += 1
+                self._state = 'value'
+
+            elif state == 'value':
+                if self._key == 'data' and char in '[{' and self._value_start < 0:
+                    self._data_closer = ']' if char == '[' else '}'
+                    self._pos += 1
+                    self._state = 'first_element'
+                    continue
+                scanned = self._scan(final)
+                if scanned is None:
+                    break
+                self.members[str(self._key)] = scanned[0]
+                self._state = 'separator'
+
+            elif state == 'separator':
+                if char == ',':
+                    self._state = 'key'
+                elif char == '}':
+                    self._state = 'done'
+                else:
+                    raise self._error("',' delimiter")
+                self._pos += 1
+
+            elif state in ('first_element', 'element'):
+                if char == self._data_closer and state == 'first_element':
+                    self._members_data()
+                    self._pos += 1
+                    self._state = 'separator'
+                    continue
+                if self._data_closer == '}' and self._data_key is None:
+                    if char != '"':
+                        raise self._error('property name')
+                    scanned = self._scan(final)
+                    if scanned is None:
+                        break
+                    self._data_key = scanned[0]
+                    self._state = 'element_colon'
+                    continue
+                scanned = self._scan(final)
+                if scanned is None:
+                    break
+                if self._data_key is not None:
+                    results.append({self._data_key: scanned[0]})
+                    self._data_key = None
+                else:
+                    results.append(scanned[0])
+                self.count += 1
+                self._state = 'element_separator'
+
+            elif state == 'element_colon':
+                if char != ':':
+                    raise self._error("':' delimiter")
+                self._pos += 1
+                self._state = 'element'
+
+            elif state == 'element_separator':
+                if char == ',':
+                    self._state = 'element'
+                elif char == self._data_closer:
+                    self._members_data()
+                    self._state = 'separator'
+                else:
+                    raise self._error("',' delimiter")
+                self._pos += 1
+
+            else:
+                raise self._error('end of document')
+
+        return results
+
+    def _members_data(self) -> None:
+        # Record that `data` was streamed, without keeping its elements
+        self.members['data'] = [] if self._data_closer == ']' else {}
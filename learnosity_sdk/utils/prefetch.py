@@ -0,0 +1,116 @@
+import collections
+import threading
+from types import TracebackType
+from typing import Any, Deque, Generic, Iterator, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+
+class Prefetcher(Generic[T]):
+    """
+    Consume an iterator on a background thread, ahead of its consumer
+
+    The source iterator yields `(value, size)` tuples. Up to `depth` values
+    are buffered, and no new value is fetched while the buffered values add
+    up to `max_size` or more. At least one value is always buffered, so a
+    single value larger than `max_size` does not stall the iteration.
+
+    Exceptions raised by the source are re-raised to the consumer, in order.
+    Calling `close` (or leaving the `with` block) stops the background thread
+    after the value it is currently fetching.
+    """
+
+    def __init__(self, source: Iterator[Tuple[T, int]], depth: int = 1,
+                 max_size: Optional[int] = None) -> None:
+        if depth < 1:
+            raise ValueError('depth must be at least 1')
+
+        self.depth = depth
+        self.max_size = max_size
+
+        self._source = source
+        self._buffer: Deque[Tuple[T, int]] = collections.deque()
+        self._buffered_size = 0
+        self._error: Optional[BaseException] = None
+        self._done = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'Prefetcher[T]':
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self._thread is None:
+            self._start()
+
+        with self._cond:
+            while not self._buffer and not self._done:
+                self._cond.wait()
+
+            if self._buffer:
+                value, size = self._buffer.popleft()
+                self._buffered_size -= size
+                self._cond.notify_all()
+                return value
+
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+            raise StopIteration
+
+    def close(self) -> None:
+        "Stop fetching values and discard any buffered ones"
+        with self._cond:
+            self._closed = True
+            self._buffer.clear()
+            self._buffered_size = 0
+            self._cond.notify_all()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name='learnosity-prefetch', daemon=True)
+        self._thread.start()
+
+    def _is_full(self) -> bool:
+        if len(self._buffer) >= self.depth:
+            return True
+        return (self.max_size is not None and len(self._buffer) > 0
+                and self._buffered_size >= self.max_size)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while self._is_full() and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+
+                item = next(self._source, None)
+
+                with self._cond:
+                    if item is None or self._closed:
+                        return
+                    self._buffer.append(item)
+                    self._buffered_size += item[1]
+                    self._cond.notify_all()
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+            close: Any = getattr(self._source, 'close', None)
+            if close is not None:
+                close()
@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar, cast
+
+T = TypeVar('T')
+
+
+class _Call(Generic[T]):
+    "A call in flight, and its outcome once complete"
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesce concurrent calls with the same key into a single call
+
+    While a call for a key is in flight, other threads calling `do` with the
+    same key wait for it and receive its result (or its exception), instead
+    of making the call again. Once the call completes, the next call for the
+    key runs again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[T]] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """
+        Call `func`, unless a call for `key` is already in flight
+
+        Args:
+            key (string): Identifies identical calls
+            func (callable): Makes the call
+
+        Returns:
+            The result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(T, call.result)
+
+        try:
+            result = func()
+            call.result = result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return result
+
+    def in_flight(self, key: str) -> int:
+        "The number of callers waiting on the call for a key, including its own"
+        with self._lock:
+            call = self._calls.get(key)
+            return 0 if call is None else call.waiters + 1
@@ -28,6 +28,8 @@ TEST_REQUIRES = [
     'types-requests',
     'types-Jinja2',
     'mypy',
+    'orjson',
+    'httpx',
 ]
 
 # Extract the markdown content of the README to be sent to Pypi as the project description page.
@@ -50,6 +52,8 @@ setuptools.setup(
         'dev': DEV_REQUIRES,
         'test': TEST_REQUIRES,
         'quickstart': ['jinja2'],
+        'orjson': ['orjson'],
+        'async': ['httpx'],
     },
     entry_points={
     'console_scripts': [
@@ -0,0 +1,48 @@
+"""
+Compare the time per call of a validated Init and a trusted Init made from a
+ValidatedSecurity
+
+Run with:
+
+    python -m tests.benchmarks.bench_init
+"""
+import timeit
+from typing import Any, Callable, Dict
+
+from learnosity_sdk.request import Init, ValidatedSecurity
+
+SECRET = '74c5fd430cf1242a527f6223aebd42d30464be22'
+SECURITY = {
+    'consumer_key': 'yis0TYCu7U9V4o7M',
+    'domain': 'localhost',
+    'timestamp': '20140626-0528',
+}
+REQUEST: Dict[str, Any] = {
+    'activity_id': 'exam',
+    'user_id': 'user_1',
+    'session_id': 'session_1',
+    'items': ['item_1', 'item_2'],
+}
+
+
+def best(function: Callable[[], Any], number: int) -> float:
+    "The best time per call of five runs, in microseconds"
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 20000) -> None:
+    validated = ValidatedSecurity('items', SECURITY, SECRET)
+
+    cases = [
+        ('_validate_security', lambda: Init._validate_security('items', SECURITY, SECRET, None)),
+        ('Init', lambda: Init('items', SECURITY, SECRET, REQUEST, lazy=True)),
+        ('ValidatedSecurity.init', lambda: validated.init(REQUEST, lazy=True)),
+        ('Init.generate', lambda: Init('items', SECURITY, SECRET, REQUEST).generate()),
+        ('ValidatedSecurity.generate', lambda: validated.generate(REQUEST)),
+    ]
+    for name, function in cases:
+        print('{:<28} {:8.2f} us'.format(name, best(function, number)))
+
+
+if __name__ == '__main__':
+    main()
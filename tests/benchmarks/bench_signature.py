@@ -0,0 +1,68 @@
+"""
+Compare the time to sign a large request with the signature cache off, and on
+a cache hit
+
+Run with:
+
+    python -m tests.benchmarks.bench_signature
+"""
+import timeit
+from typing import Any, Callable
+
+from learnosity_sdk.request import Init, Placeholder, RequestTemplate
+
+SECRET = '74c5fd430cf1242a527f6223aebd42d30464be22'
+SECURITY = {
+    'consumer_key': 'yis0TYCu7U9V4o7M',
+    'domain': 'localhost',
+    'timestamp': '20140626-0528',
+}
+# About 1.5 MB of inline questions
+TEMPLATE = RequestTemplate({
+    'activity_id': 'exam',
+    'user_id': Placeholder('user_id'),
+    'session_id': Placeholder('session_id'),
+    'questions': [
+        {
+            'response_id': 'response_{}'.format(i),
+            'type': 'shorttext',
+            'stimulus': 'What is {} + {}? '.format(i, i) + 'x' * 200,
+            'validation': {'valid_response': {'score': 1, 'value': str(2 * i)}},
+        }
+        for i in range(4500)
+    ],
+})
+
+
+def best(function: Callable[[], Any], number: int) -> float:
+    "The best time per call of five runs, in microseconds"
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 200) -> None:
+    request = TEMPLATE.render(user_id='user_1', session_id='session_1')
+    print('request size {:.2f} MB'.format(
+        len(request.request_string(Init('items', SECURITY, SECRET).get_sdk_meta())) / 1e6))
+
+    def sign() -> Any:
+        return Init('items', SECURITY, SECRET, request, lazy=True).security
+
+    def generate() -> Any:
+        return Init('items', SECURITY, SECRET, request).generate()
+
+    Init.disable_signature_cache()
+    cases = [('signature, cache off', best(sign, number)),
+             ('generate, cache off', best(generate, number))]
+
+    Init.enable_signature_cache()
+    sign()
+    cases += [('signature, cache hit', best(sign, number)),
+              ('generate, cache hit', best(generate, number))]
+    Init.disable_signature_cache()
+
+    for name, time in cases:
+        print('{:<28} {:8.2f} us'.format(name, time))
+
+
+if __name__ == '__main__':
+    main()
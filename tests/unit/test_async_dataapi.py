@@ -0,0 +1,142 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+import unittest
+from urllib.parse import parse_qs
+from learnosity_sdk.request import AsyncDataApi
+from learnosity_sdk.request.async_dataapi import HAS_HTTPX
+from learnosity_sdk.exceptions import DataApiException
+
+if HAS_HTTPX:
+    import httpx
+
+
+@unittest.skipUnless(HAS_HTTPX, 'httpx is not installed')
+class UnitTestAsyncDataApiClient(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests to ensure that the asyncio Data API client functions correctly.
+    """
+
+    def setUp(self) -> None:
+        self.security = {
+            'consumer_key': 'yis0TYCu7U9V4o7M',
+            'domain': 'demos.learnosity.com'
+        }
+        self.consumer_secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+        self.request = {
+            'references': ['item_2', 'item_3'],
+            'limit': 1
+        }
+        self.action = 'get'
+        self.endpoint = 'https://data.learnosity.com/v1/itembank/items'
+        self.dummy_responses: List[Dict[str, Any]] = [{
+            'meta': {
+                'status': True,
+                'timestamp': 1514874527,
+                'records': 2,
+                'next': '1'
+            },
+            'data': [{'id': 'a'}]
+        }, {
+            'meta': {
+                'status': True,
+                'timestamp': 1514874527,
+                'records': 2
+            },
+            'data': [{'id': 'b'}]
+        }]
+        self.calls: List['httpx.Request'] = []
+
+    def _client(self, responses: List['httpx.Response'], **kwargs: Any) -> AsyncDataApi:
+        """Return a client answering each request with the next response"""
+        def handler(request: 'httpx.Request') -> 'httpx.Response':
+            self.calls.append(request)
+            return responses.pop(0) if len(responses) > 1 else responses[0]
+
+        transport = httpx.MockTransport(handler)
+        return AsyncDataApi(client=httpx.AsyncClient(transport=transport), **kwargs)
+
+    def _body(self, request: 'httpx.Request') -> Dict[str, List[str]]:
+        return parse_qs(request.content.decode('utf-8'))
+
+    async def test_request(self) -> None:
+        """Verify that `request` sends a signed request with routing headers"""
+        async with self._client([httpx.Response(200, json=self.dummy_responses[0])]) as client:
+            res = await client.request(self.endpoint, self.security,
+                                       self.consumer_secret, self.request,
+                                       self.action)
+
+        assert res.json() == self.dummy_responses[0]
+        assert 'signature' in json.loads(self._body(self.calls[0])['security'][0])
+        headers = self.calls[0].headers
+        assert headers['X-Learnosity-Action'] == 'get_/itembank/items'
+        assert headers['X-Learnosity-Consumer'] == 'yis0TYCu7U9V4o7M'
+
+    async def test_request_iter(self) -> None:
+        """Verify that `request_iter` follows `meta.next` across pages"""
+        responses = [httpx.Response(200, json=dummy) for dummy in self.dummy_responses]
+        async with self._client(responses) as client:
+            pages = [page async for page in client.request_iter(
+                self.endpoint, self.security, self.consumer_secret,
+                self.request, self.action)]
+
+        assert len(pages) == 2
+        assert pages[1]['data'][0]['id'] == 'b'
+        assert json.loads(self._body(self.calls[1])['request'][0])['next'] == '1'
+
+    async def test_results_iter(self) -> None:
+        """Verify that `results_iter` yields individual results"""
+        responses = [httpx.Response(200, json=dummy) for dummy in self.dummy_responses]
+        async with self._client(responses) as client:
+            results = [result async for result in client.results_iter(
+                self.endpoint, self.security, self.consumer_secret,
+                self.request, self.action)]
+
+        assert [r['id'] for r in results] == ['a', 'b']
+
+    async def test_results_iter_error_status(self) -> None:
+        """Verify that a DataApiException is raised if http status is not ok"""
+        async with self._client([httpx.Response(500, json={})]) as client:
+            with self.assertRaisesRegex(DataApiException, "server returned HTTP status 500"):
+                async for _ in client.results_iter(
+                        self.endpoint, self.security, self.consumer_secret,
+                        self.request, self.action):
+                    pass
+
+    async def test_max_concurrency(self) -> None:
+        """Verify that no more than `max_concurrency` requests are in flight"""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: 'httpx.Request') -> 'httpx.Response':
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json=self.dummy_responses[1])
+
+        transport = httpx.MockTransport(handler)
+        async with AsyncDataApi(max_concurrency=3,
+                                client=httpx.AsyncClient(transport=transport)) as client:
+            await asyncio.gather(*[
+                client.request(self.endpoint, self.security,
+                               self.consumer_secret, self.request)
+                for _ in range(10)])
+
+        assert peak == 3
+
+    async def test_external_client_not_closed(self) -> None:
+        """Verify that a client passed in is left open"""
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=self.dummy_responses[1])))
+        async with AsyncDataApi(client=http_client):
+            pass
+
+        assert not http_client.is_closed
+        await http_client.aclose()
+
+    def test_invalid_max_concurrency(self) -> None:
+        """Verify that `max_concurrency` must be positive"""
+        with self.assertRaises(ValueError):
+            AsyncDataApi(max_concurrency=0)
@@ -0,0 +1,95 @@
+import json
+from typing import Any, Dict, List, Tuple
+import unittest
+from urllib.parse import parse_qs
+import responses
+from learnosity_sdk.request import BulkWriter, DataApi
+from learnosity_sdk.exceptions import DataApiException
+
+
+class UnitTestBulkWriter(unittest.TestCase):
+    """
+    Tests to ensure that bulk writes are batched and reported correctly.
+    """
+
+    def setUp(self) -> None:
+        self.security = {
+            'consumer_key': 'yis0TYCu7U9V4o7M',
+            'domain': 'demos.learnosity.com'
+        }
+        self.consumer_secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+        self.endpoint = 'https://data.learnosity.com/v1/itembank/items'
+        self.records = [{'reference': 'item_{}'.format(i)} for i in range(10)]
+
+    def _writer(self, **kwargs: Any) -> BulkWriter:
+        return BulkWriter(DataApi(), self.endpoint, self.security,
+                          self.consumer_secret, **kwargs)
+
+    def _callback(self, request: Any) -> Tuple[int, Dict[str, str], str]:
+        request_packet = json.loads(parse_qs(request.body)['request'][0])
+        failed = any(r['reference'] == 'item_bad' for r in request_packet['items'])
+        return (200, {}, json.dumps({
+            'meta': {'status': not failed},
+            'data': [],
+        }))
+
+    def test_batches_by_count(self) -> None:
+        batches = list(self._writer(max_batch_records=4).batches(self.records))
+        assert [len(b) for b in batches] == [4, 4, 2]
+
+    def test_batches_by_size(self) -> None:
+        # Each record encodes to 22 bytes, plus one for the separator
+        batches = list(self._writer(max_batch_bytes=50).batches(self.records))
+        assert [len(b) for b in batches] == [2] * 5
+
+    def test_oversized_record_sent_alone(self) -> None:
+        records: List[Dict[str, Any]] = [{'reference': 'x' * 100}, {'reference': 'y'}]
+        batches = list(self._writer(max_batch_bytes=50).batches(records))
+        assert [len(b) for b in batches] == [1, 1]
+
+    @responses.activate
+    def test_write(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        results = list(self._writer(max_batch_records=3).write(self.records))
+
+        assert len(results) == 4
+        assert all(r.ok for r in results)
+        assert sorted(r.batch_index for r in results) == [0, 1, 2, 3]
+        body = parse_qs(str(responses.calls[0].request.body))
+        assert body['action'] == ['set']
+        assert len(json.loads(body['request'][0])['items']) in (1, 3)
+
+    @responses.activate
+    def test_write_reports_failed_batches(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        self.records[4] = {'reference': 'item_bad'}
+        results = sorted(self._writer(max_batch_records=3).write(self.records))
+
+        assert [r.ok for r in results] == [True, False, True, True]
+        assert isinstance(results[1].error, DataApiException)
+        assert results[1].records[1] == {'reference': 'item_bad'}
+
+    @responses.activate
+    def test_write_reports_malformed_responses(self) -> None:
+        bodies = [{'unexpected': True}, {'meta': {'status': True}, 'data': []}]
+        responses.add_callback(responses.POST, self.endpoint,
+                               callback=lambda request: (200, {}, json.dumps(bodies.pop(0))))
+        results = sorted(self._writer(max_batch_records=5, max_in_flight=1).write(self.records))
+
+        assert [r.ok for r in results] == [False, True]
+        assert isinstance(results[0].error, DataApiException)
+
+    @responses.activate
+    def test_write_reports_http_errors(self) -> None:
+        responses.add(responses.POST, self.endpoint, json={}, status=500)
+        results = list(self._writer().write(self.records))
+
+        assert len(results) == 1
+        assert not results[0].ok
+        assert results[0].response is not None
+        assert results[0].response.status_code == 500
+
+    def test_records_key_from_endpoint(self) -> None:
+        writer = BulkWriter(DataApi(), 'https://data.learnosity.com/v1/itembank/activities',
+                            self.security, self.consumer_secret)
+        assert writer.records_key == 'activities'
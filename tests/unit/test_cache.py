@@ -0,0 +1,193 @@
+import os
+import tempfile
+from typing import Any, Dict, List
+import unittest
+from unittest.mock import patch
+import responses
+from learnosity_sdk.request import DataApi
+from learnosity_sdk.request.cache import DiskCache, MemoryCache, ResponseCache
+
+
+class TestMemoryCache(unittest.TestCase):
+    """
+    Tests for the in-memory response cache
+    """
+
+    def test_lru_eviction(self) -> None:
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        assert cache.get('a') == b'1'
+        cache.set('c', b'3')
+
+        assert cache.get('b') is None
+        assert cache.get('a') == b'1'
+        assert cache.get('c') == b'3'
+
+    def test_ttl(self) -> None:
+        now = [100.0]
+        cache = MemoryCache(ttl=10, clock=lambda: now[0])
+        cache.set('a', b'1')
+        now[0] += 5
+        assert cache.get('a') == b'1'
+        now[0] += 6
+        assert cache.get('a') is None
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Tests for the on-disk response cache
+    """
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_persists_across_instances(self) -> None:
+        DiskCache(self.tmpdir.name).set('a', b'value')
+        assert DiskCache(self.tmpdir.name).get('a') == b'value'
+
+    def test_lru_eviction(self) -> None:
+        cache = DiskCache(self.tmpdir.name, maxsize=2)
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        os.utime(os.path.join(self.tmpdir.name, 'a.cache'), (1, 1))
+        os.utime(os.path.join(self.tmpdir.name, 'b.cache'), (2, 2))
+        cache.set('c', b'3')
+
+        assert cache.get('a') is None
+        assert cache.get('b') == b'2'
+        assert cache.get('c') == b'3'
+
+    def test_eviction_batched(self) -> None:
+        cache = DiskCache(self.tmpdir.name, maxsize=100)
+        with patch.object(cache, '_files', wraps=cache._files) as files:
+            for i in range(200):
+                cache.set(str(i), b'1')
+
+        # Evicted down to 90 entries, so once per 11 new entries
+        assert files.call_count == 10
+        assert len(os.listdir(self.tmpdir.name)) == 90
+
+    def test_ttl(self) -> None:
+        cache = DiskCache(self.tmpdir.name, ttl=10)
+        cache.set('a', b'1')
+        with patch('time.time', return_value=1e12):
+            assert cache.get('a') is None
+        assert not os.path.exists(os.path.join(self.tmpdir.name, 'a.cache'))
+
+    def test_clear(self) -> None:
+        cache = DiskCache(self.tmpdir.name)
+        cache.set('a', b'1')
+        cache.clear()
+        assert cache.get('a') is None
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Tests for the cache base class
+    """
+
+    def test_incomplete_cache(self) -> None:
+        class GetOnlyCache(ResponseCache):
+            def get(self, key: str) -> None:
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyCache()  # type: ignore[abstract]
+
+
+class TestDataApiCache(unittest.TestCase):
+    """
+    Tests for caching read-only Data API requests
+    """
+
+    endpoint = 'https://data.learnosity.com/v1/itembank/items'
+    security = {'consumer_key': 'key', 'domain': 'localhost'}
+    secret = 'secret'
+    page: Dict[str, Any] = {'meta': {'status': True}, 'data': [{'reference': 'item_1'}]}
+
+    @responses.activate
+    def test_request_cached(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(cache=MemoryCache())
+        for timestamp in ('20240101-0000', '20240101-0001'):
+            security = dict(self.security, timestamp=timestamp)
+            res = client.request(self.endpoint, security, self.secret,
+                                 {'references': ['item_1']}, 'get')
+            assert res.json() == self.page
+
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_results_iter_cached(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(cache=MemoryCache())
+        results: List[List[Dict[str, Any]]] = [
+            list(client.results_iter(self.endpoint, self.security, self.secret,
+                                     {'references': ['item_1']}))
+            for _ in range(2)]
+
+        assert results[0] == results[1] == self.page['data']
+        assert len(responses.calls) == 1
+
+        # The cached page is shared with `request`
+        res = client.request(self.endpoint, self.security, self.secret,
+                             {'references': ['item_1']})
+        assert res.json() == self.page
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_cache_key_includes_request(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(cache=MemoryCache())
+        client.request(self.endpoint, self.security, self.secret, {'references': ['item_1']})
+        client.request(self.endpoint, self.security, self.secret, {'references': ['item_2']})
+
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_writes_and_errors_not_cached(self) -> None:
+        responses.add(responses.POST, self.endpoint, json={}, status=500)
+        client = DataApi(cache=MemoryCache())
+        for action in ('set', 'set', 'get', 'get'):
+            client.request(self.endpoint, self.security, self.secret, {}, action)
+
+        assert len(responses.calls) == 4
+
+    @responses.activate
+    def test_unsuccessful_pages_not_cached(self) -> None:
+        responses.add(responses.POST, self.endpoint, json={'meta': {'status': False}})
+        responses.add(responses.POST, self.endpoint, body='not json')
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(cache=MemoryCache())
+        for _ in range(2):
+            client.request(self.endpoint, self.security, self.secret, {})
+
+        results = list(client.results_iter(self.endpoint, self.security, self.secret))
+        assert results == self.page['data']
+        assert len(responses.calls) == 3
+
+    @responses.activate
+    def test_cache_key_includes_secret(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(cache=MemoryCache(), coalesce=True)
+        for secret in (self.secret, 'WRONG', self.secret):
+            client.request(self.endpoint, self.security, secret, {})
+
+        assert len(responses.calls) == 2
+        bodies = [call.request.body for call in responses.calls]
+        assert bodies[0] != bodies[1]
+
+    @responses.activate
+    def test_disk_cache(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                client = DataApi(cache=DiskCache(directory))
+                results = list(client.results_iter(self.endpoint, self.security, self.secret))
+                assert results == self.page['data']
+
+        assert len(responses.calls) == 1
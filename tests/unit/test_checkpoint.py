@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple
+import unittest
+from urllib.parse import parse_qs
+import responses
+from learnosity_sdk.request import DataApi
+from learnosity_sdk.request.checkpoint import (
+    Checkpoint, CheckpointStore, FileCheckpointStore, SqliteCheckpointStore)
+
+
+class TestCheckpointStores(unittest.TestCase):
+    """
+    Tests for the local checkpoint stores
+    """
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _stores(self) -> List[CheckpointStore]:
+        return [
+            FileCheckpointStore(os.path.join(self.tmpdir.name, 'checkpoints.json')),
+            SqliteCheckpointStore(os.path.join(self.tmpdir.name, 'checkpoints.db')),
+        ]
+
+    def test_save_load_clear(self) -> None:
+        for store in self._stores():
+            with self.subTest(store=store):
+                assert store.load('a') is None
+                store.save('a', Checkpoint('cursor1', 10))
+                store.save('b', Checkpoint(None, 20, True))
+                store.save('a', Checkpoint('cursor2', 15))
+
+                assert store.load('a') == Checkpoint('cursor2', 15, False)
+                assert store.load('b') == Checkpoint(None, 20, True)
+
+                store.clear('a')
+                assert store.load('a') is None
+                assert store.load('b') is not None
+
+    def test_incomplete_store(self) -> None:
+        class LoadOnlyStore(CheckpointStore):
+            def load(self, key: str) -> None:
+                return None
+
+        with self.assertRaises(TypeError):
+            LoadOnlyStore()  # type: ignore[abstract]
+
+
+class TestCheckpointedIteration(unittest.TestCase):
+    """
+    Tests for saving and resuming the progress of Data API queries
+    """
+
+    endpoint = 'https://data.learnosity.com/v1/itembank/items'
+    security = {'consumer_key': 'key', 'domain': 'localhost'}
+    secret = 'secret'
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = FileCheckpointStore(os.path.join(self.tmpdir.name, 'checkpoints.json'))
+        self.pages: List[Dict[str, Any]] = [
+            {'meta': {'status': True, 'next': str(i + 1)}, 'data': [{'id': i}]}
+            for i in range(3)
+        ]
+        self.pages[-1]['meta'].pop('next')
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _callback(self, request: Any) -> Tuple[int, Dict[str, str], str]:
+        """Return the page matching the request's cursor"""
+        request_packet = json.loads(parse_qs(request.body)['request'][0])
+        return (200, {}, json.dumps(self.pages[int(request_packet.get('next', 0))]))
+
+    @responses.activate
+    def test_resume_after_interruption(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        client = DataApi()
+
+        pages = client.request_iter(self.endpoint, self.security, self.secret,
+                                    {'limit': 1}, 'get', checkpoint=self.store)
+        next(pages)
+        next(pages)
+        # The second page was not acknowledged when the export stopped
+        pages.close()
+
+        key = client._checkpoint_key(self.endpoint, self.security, {'limit': 1}, 'get')
+        assert self.store.load(key) == Checkpoint('1', 1, False)
+
+        results = list(client.resume_results_iter(
+            self.endpoint, self.security, self.secret, {'limit': 1}, 'get', self.store))
+        assert results == [{'id': 1}, {'id': 2}]
+        assert self.store.load(key) == Checkpoint(None, 3, True)
+        assert len(responses.calls) == 4
+
+        # A completed query has nothing left to resume
+        assert list(client.resume_iter(
+            self.endpoint, self.security, self.secret, {'limit': 1}, 'get', self.store)) == []
+
+    @responses.activate
+    def test_resume_without_checkpoint(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        client = DataApi()
+
+        results = list(client.resume_results_iter(
+            self.endpoint, self.security, self.secret, {}, 'get', self.store,
+            checkpoint_key='export'))
+        assert len(results) == 3
+        assert self.store.load('export') == Checkpoint(None, 3, True)
@@ -1,7 +1,12 @@
-from typing import Any, Dict, cast
+from typing import Any, Dict, List, Tuple, cast
+import json
 import unittest
+from urllib.parse import parse_qs
+from unittest.mock import patch
+import requests
 import responses
-from learnosity_sdk.request import DataApi
+from requests.adapters import HTTPAdapter
+from learnosity_sdk.request import DataApi, Signer
 from learnosity_sdk.exceptions import DataApiException
 
 class UnitTestDataApiClient(unittest.TestCase):
@@ -69,6 +74,23 @@ class UnitTestDataApiClient(unittest.TestCase):
         assert sdk_header.startswith('Python:')
         assert not sdk_header.startswith('Python:v')
 
+    @responses.activate
+    def test_request_with_signer(self) -> None:
+        """
+        Verify that a Signer signs requests exactly as the raw secret does
+        """
+        responses.add(responses.POST, self.endpoint, json=self.dummy_responses[1])
+        responses.add(responses.POST, self.endpoint, json=self.dummy_responses[1])
+        client = DataApi()
+        with patch('learnosity_sdk.request.init.format_utc_time', return_value='20140626-0528'):
+            client.request(self.endpoint, self.security, self.consumer_secret,
+                           self.request, self.action)
+            client.request(self.endpoint, self.security, Signer(self.consumer_secret),
+                           self.request, self.action)
+
+        bodies = [parse_qs(cast(str, call.request.body)) for call in responses.calls]
+        assert bodies[0]['security'] == bodies[1]['security']
+
     @responses.activate
     def test_request_iter(self) -> None:
         """Verify that `request_iter` returns an iterator of pages"""
@@ -85,6 +107,20 @@ class UnitTestDataApiClient(unittest.TestCase):
         assert results[0]['data'][0]['id'] == 'a'
         assert results[1]['data'][0]['id'] == 'b'
 
+    @responses.activate
+    def test_request_iter_isolated_from_caller(self) -> None:
+        """Verify that changes to nested packets between pages are not sent"""
+        for dummy in self.dummy_responses:
+            responses.add(responses.POST, self.endpoint, json=dummy)
+        client = DataApi()
+        for page in client.request_iter(self.endpoint, self.security, self.consumer_secret,
+                                        self.request, self.action):
+            cast(List[str], self.request['references']).append('item_4')
+
+        for call in responses.calls:
+            sent = json.loads(parse_qs(cast(str, call.request.body))['request'][0])
+            assert sent['references'] == ['item_2', 'item_3']
+
     @responses.activate
     def test_results_iter(self) -> None:
         """Verify that `result_iter` returns an iterator of results"""
@@ -125,6 +161,15 @@ class UnitTestDataApiClient(unittest.TestCase):
             list(client.results_iter(self.endpoint, self.security, self.consumer_secret,
                                      self.request, self.action))
 
+    @responses.activate
+    def test_results_iter_no_meta(self) -> None:
+        """Verify that a DataApiException is raised when there is no 'meta'"""
+        responses.add(responses.POST, self.endpoint, json={'unexpected': True})
+        client = DataApi()
+        with self.assertRaisesRegex(DataApiException, "server returned an invalid response:"):
+            list(client.results_iter(self.endpoint, self.security, self.consumer_secret,
+                                     self.request, self.action))
+
     @responses.activate
     def test_results_iter_invalid_response_data(self) -> None:
         """Verify that a DataApiException is raised response data isn't valid JSON"""
@@ -243,3 +288,167 @@ class UnitTestDataApiClient(unittest.TestCase):
             sdk_header = call.request.headers['X-Learnosity-SDK']
             assert sdk_header.startswith('Python:')
             assert not sdk_header.startswith('Python:v')
+
+    @responses.activate
+    def test_session_reused_across_pages(self) -> None:
+        """Verify that all pages of an iterator are sent through one session"""
+        for dummy in self.dummy_responses:
+            responses.add(responses.POST, self.endpoint, json=dummy)
+        client = DataApi()
+        session = client.session
+        list(client.request_iter(self.endpoint, self.security, self.consumer_secret,
+                                 self.request, self.action))
+
+        assert len(responses.calls) == 2
+        assert client.session is session
+
+    def test_session_pool_configuration(self) -> None:
+        """Verify that the session adapter is configured from the constructor"""
+        client = DataApi(pool_connections=2, pool_maxsize=20, max_retries=3,
+                         keep_alive=False)
+        adapter = cast(HTTPAdapter, client.session.get_adapter(self.endpoint))
+
+        assert adapter.poolmanager.connection_pool_kw['maxsize'] == 20
+        assert adapter.max_retries.total == 3
+        assert client.session.headers['Connection'] == 'close'
+
+    def test_context_manager_closes_session(self) -> None:
+        """Verify that leaving the context manager closes the owned session"""
+        client = DataApi()
+        with patch.object(client.session, 'close') as close:
+            with client:
+                pass
+        close.assert_called_once_with()
+        assert client._session is None
+
+    def test_external_session_not_closed(self) -> None:
+        """Verify that a session passed in by the caller is left open"""
+        session = requests.Session()
+        with patch.object(session, 'close') as close:
+            with DataApi(session=session) as client:
+                assert client.session is session
+        close.assert_not_called()
+
+    def test_new_session_after_fork(self) -> None:
+        """Verify that a forked process does not reuse the parent's session"""
+        client = DataApi()
+        session = client.session
+        with patch('os.getpid', return_value=client._pid + 1):
+            assert client.session is not session
+
+    @responses.activate
+    def test_request_iter_prefetch(self) -> None:
+        """Verify that `request_iter` yields the same pages when prefetching"""
+        for dummy in self.dummy_responses:
+            responses.add(responses.POST, self.endpoint, json=dummy)
+        client = DataApi()
+        pages = list(client.request_iter(self.endpoint, self.security, self.consumer_secret,
+                                         self.request, self.action, prefetch=2))
+
+        assert pages == self.dummy_responses
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_results_iter_prefetch_error_status(self) -> None:
+        """Verify that errors on a prefetched page are raised to the consumer"""
+        responses.add(responses.POST, self.endpoint, json=self.dummy_responses[0])
+        responses.add(responses.POST, self.endpoint, json={}, status=500)
+        client = DataApi()
+        results = client.results_iter(self.endpoint, self.security, self.consumer_secret,
+                                      self.request, self.action, prefetch=1)
+
+        assert next(results)['id'] == 'a'
+        with self.assertRaisesRegex(DataApiException, "server returned HTTP status 500"):
+            next(results)
+
+    def _references_callback(self, request: Any) -> Tuple[int, Dict[str, str], str]:
+        """Respond to an items request with one result per reference"""
+        body = parse_qs(request.body)
+        request_packet = json.loads(body['request'][0])
+        return (200, {}, json.dumps({
+            'meta': {'status': True, 'records': len(request_packet['references'])},
+            'data': [{'reference': r} for r in request_packet['references']]
+        }))
+
+    @responses.activate
+    def test_results_iter_chunked(self) -> None:
+        """Verify that a large list of references is split into chunks"""
+        responses.add_callback(responses.POST, self.endpoint,
+                               callback=self._references_callback)
+        references = ['item_{}'.format(i) for i in range(120)]
+        client = DataApi()
+        results = list(client.results_iter_chunked(
+            self.endpoint, self.security, self.consumer_secret,
+            {'references': references}, self.action))
+
+        # The default chunk size for items is 50
+        assert len(responses.calls) == 3
+        assert sorted(r['reference'] for r in results) == sorted(references)
+
+    @responses.activate
+    def test_results_iter_chunked_preserve_order(self) -> None:
+        """Verify that chunk results can be returned in the input order"""
+        responses.add_callback(responses.POST, self.endpoint,
+                               callback=self._references_callback)
+        references = ['item_{}'.format(i) for i in range(25)]
+        client = DataApi()
+        results = list(client.results_iter_chunked(
+            self.endpoint, self.security, self.consumer_secret,
+            {'references': references}, self.action,
+            chunk_size=4, max_workers=3, preserve_order=True))
+
+        assert len(responses.calls) == 7
+        assert [r['reference'] for r in results] == references
+
+    @responses.activate
+    def test_results_iter_chunked_error(self) -> None:
+        """Verify that a failed chunk raises a DataApiException"""
+        responses.add(responses.POST, self.endpoint, json={}, status=500)
+        client = DataApi()
+        with self.assertRaisesRegex(DataApiException, "server returned HTTP status 500"):
+            list(client.results_iter_chunked(
+                self.endpoint, self.security, self.consumer_secret,
+                {'references': ['a', 'b', 'c']}, self.action, chunk_size=1))
+
+    def test_results_iter_chunked_unknown_endpoint(self) -> None:
+        """Verify that chunking needs a known limit or an explicit one"""
+        client = DataApi()
+        with self.assertRaises(ValueError):
+            list(client.results_iter_chunked(
+                'https://data.learnosity.com/v1/unknown', self.security,
+                self.consumer_secret, {'references': ['a']}, self.action))
+
+    @responses.activate
+    def test_results_iter_stream(self) -> None:
+        """Verify that streamed results match the results of whole pages"""
+        self.dummy_responses[1]['data'] = {'id': 'b'}
+        for dummy in self.dummy_responses:
+            responses.add(responses.POST, self.endpoint, json=dummy)
+        client = DataApi()
+        client.stream_chunk_size = 7
+        results = list(client.results_iter(self.endpoint, self.security, self.consumer_secret,
+                                           self.request, self.action, stream=True))
+
+        assert results == [{'id': 'a'}, {'id': 'b'}]
+        assert len(responses.calls) == 2
+        body = parse_qs(str(responses.calls[1].request.body))
+        assert json.loads(body['request'][0])['next'] == '1'
+
+    @responses.activate
+    def test_results_iter_stream_no_meta_status(self) -> None:
+        """Verify that an unsuccessful streamed page raises a DataApiException"""
+        self.dummy_responses[0]['meta']['status'] = False  # type: ignore[index]
+        responses.add(responses.POST, self.endpoint, json=self.dummy_responses[0])
+        client = DataApi()
+        with self.assertRaisesRegex(DataApiException, "server returned unsuccessful status:"):
+            list(client.results_iter(self.endpoint, self.security, self.consumer_secret,
+                                     self.request, self.action, stream=True))
+
+    @responses.activate
+    def test_results_iter_stream_invalid_json(self) -> None:
+        """Verify that an invalid streamed page raises a DataApiException"""
+        responses.add(responses.POST, self.endpoint, body='{"meta": {"status": true}, "data": [')
+        client = DataApi()
+        with self.assertRaisesRegex(DataApiException, "server returned invalid json: "):
+            list(client.results_iter(self.endpoint, self.security, self.consumer_secret,
+                                     self.request, self.action, stream=True))
@@ -0,0 +1,45 @@
+import threading
+from typing import List
+import unittest
+from learnosity_sdk.utils.executor import bounded_map
+
+
+class TestBoundedMap(unittest.TestCase):
+    """
+    Tests for mapping a function over a bounded pool of threads
+    """
+
+    def test_preserve_order(self) -> None:
+        def slow_for_small(value: int) -> int:
+            threading.Event().wait(0.001 * (10 - value))
+            return value * 2
+
+        results = list(bounded_map(slow_for_small, range(10), 4, preserve_order=True))
+        assert results == [v * 2 for v in range(10)]
+
+    def test_unordered(self) -> None:
+        results = list(bounded_map(lambda v: v + 1, range(20), 3))
+        assert sorted(results) == list(range(1, 21))
+
+    def test_max_workers_bounds_calls(self) -> None:
+        lock = threading.Lock()
+        in_flight: List[int] = [0, 0]
+
+        def track(value: int) -> int:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            threading.Event().wait(0.005)
+            with lock:
+                in_flight[0] -= 1
+            return value
+
+        list(bounded_map(track, range(20), 3))
+        assert in_flight[1] <= 3
+
+    def test_error_raised(self) -> None:
+        def fail(value: int) -> int:
+            raise RuntimeError('failed')
+
+        with self.assertRaisesRegex(RuntimeError, 'failed'):
+            list(bounded_map(fail, range(3), 2))
@@ -1,7 +1,13 @@
 import collections
-from typing import Dict, Optional
+import copy
+import json
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple, cast
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
+import learnosity_sdk.exceptions
 import learnosity_sdk.request
 
 ServiceTestSpec = collections.namedtuple(
@@ -126,6 +132,281 @@ class TestServiceRequests(unittest.TestCase):
                 self.assertFalse(init.is_telemetry_enabled(), 'Telemetry still enabled')
                 self.assertEqual(t.signature, init.generate_signature(), 'Signature mismatch')
 
+    def test_init_generate_with_signer(self) -> None:
+        """
+        Test that a reused Signer generates the same signatures as a secret
+        """
+        learnosity_sdk.request.Init.disable_telemetry()
+        signer = learnosity_sdk.request.Signer(self.secret)
+        for _ in range(2):
+            for t in ServiceTests:
+                with self.subTest(repr(t), t=t):
+                    security = self._prepare_security(t.security)
+                    init = learnosity_sdk.request.Init(
+                        t.service, security, signer, request=t.request, action=t.action)
+
+                    self.assertEqual(t.signature, init.generate_signature(), 'Signature mismatch')
+                    self.assertEqual(self.secret, init.secret)
+
+    def test_signer_does_not_expose_secret(self) -> None:
+        signer = learnosity_sdk.request.Signer(self.secret)
+        self.assertNotIn(self.secret, repr(signer))
+
+    def test_generate_many(self) -> None:
+        """
+        Test that Init.generate_many() generates the same packets as Init
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        for t in ServiceTests:
+            with self.subTest(repr(t), t=t):
+                security = self._prepare_security(t.security)
+                expected = learnosity_sdk.request.Init(
+                    t.service, security, self.secret, request=t.request,
+                    action=t.action).generate()
+
+                packets = learnosity_sdk.request.Init.generate_many(
+                    t.service, security, self.secret, [t.request] * 3, action=t.action)
+
+                self.assertEqual([expected] * 3, list(packets))
+
+    def test_generate_many_processes(self) -> None:
+        """
+        Test that Init.generate_many() keeps the order of requests signed in
+        other processes
+        """
+        security = self._prepare_security()
+        requests = [{'user_id': 'user_{}'.format(i), 'session_id': str(i)} for i in range(7)]
+        expected = [
+            learnosity_sdk.request.Init('items', security, self.secret, request).generate(False)
+            for request in requests]
+
+        packets = learnosity_sdk.request.Init.generate_many(
+            'items', security, self.secret, requests, encode=False, processes=2, chunk_size=2)
+
+        self.assertEqual(expected, list(packets))
+
+    def test_generate_many_spawn(self) -> None:
+        """
+        Test that Init.generate_many() passes the telemetry setting to
+        processes that do not inherit it
+        """
+        security = self._prepare_security()
+        requests = [{'user_id': 'user_{}'.format(i), 'session_id': str(i)} for i in range(3)]
+        for telemetry in (False, True):
+            with self.subTest(telemetry=telemetry):
+                if telemetry:
+                    learnosity_sdk.request.Init.enable_telemetry()
+                else:
+                    learnosity_sdk.request.Init.disable_telemetry()
+                expected = list(learnosity_sdk.request.Init.generate_many(
+                    'items', security, self.secret, requests, encode=False))
+
+                packets = learnosity_sdk.request.Init.generate_many(
+                    'items', security, self.secret, requests, encode=False, processes=1,
+                    mp_context=multiprocessing.get_context('spawn'))
+
+                self.assertEqual(expected, list(packets))
+        learnosity_sdk.request.Init.enable_telemetry()
+
+    def test_generate_many_invalid_arguments(self) -> None:
+        """
+        Test that Init.generate_many() rejects invalid arguments when called,
+        not when first iterated
+        """
+        security = self._prepare_security()
+        for processes, chunk_size in ((0, 1000), (2, 0)):
+            with self.subTest(processes=processes, chunk_size=chunk_size):
+                with self.assertRaises(ValueError):
+                    learnosity_sdk.request.Init.generate_many(
+                        'items', security, self.secret, [{}],
+                        processes=processes, chunk_size=chunk_size)
+
+    def test_generate_many_validates_once(self) -> None:
+        """
+        Test that Init.generate_many() validates the shared parts up front
+        """
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            learnosity_sdk.request.Init.generate_many(
+                'invalid', self._prepare_security(), self.secret, [{}])
+
+    def test_validated_security(self) -> None:
+        """
+        Test that trusted Inits from a ValidatedSecurity generate the same
+        packets as Init
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        for t in ServiceTests:
+            with self.subTest(repr(t), t=t):
+                security = self._prepare_security(t.security)
+                expected = learnosity_sdk.request.Init(
+                    t.service, security, self.secret, request=t.request,
+                    action=t.action).generate()
+
+                validated = learnosity_sdk.request.ValidatedSecurity(
+                    t.service, security, self.secret, action=t.action)
+
+                self.assertEqual(expected, validated.generate(t.request))
+                self.assertEqual(expected, validated.init(t.request, lazy=True).generate())
+
+    def test_validation_overrides(self) -> None:
+        """
+        Test that subclasses can change the valid services and security keys
+        """
+        class CustomInit(learnosity_sdk.request.Init):
+            services = learnosity_sdk.request.Init.services + ['custom']
+
+        class StrictInit(learnosity_sdk.request.Init):
+            security_keys = ['consumer_key', 'domain', 'timestamp']
+
+        security = self._prepare_security()
+        CustomInit('custom', security, self.secret, {})
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            learnosity_sdk.request.Init('custom', security, self.secret, {})
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            StrictInit('items', dict(security, user_id='user'), self.secret, {})
+        learnosity_sdk.request.Init('items', dict(security, user_id='user'), self.secret, {})
+
+        # Changes to the lists are seen, even in place
+        CustomInit('items', security, self.secret, {})
+        CustomInit.services[CustomInit.services.index('items')] = 'other'
+        CustomInit('other', security, self.secret, {})
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            CustomInit('items', security, self.secret, {})
+
+    def test_validated_security_validates_once(self) -> None:
+        """
+        Test that ValidatedSecurity validates up front, and trusted Inits not
+        at all
+        """
+        security = self._prepare_security()
+        for service, packet in (('invalid', security),
+                                ('items', dict(security, invalid='key')),
+                                ('questions', security)):
+            with self.subTest(service=service, packet=packet):
+                with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+                    learnosity_sdk.request.ValidatedSecurity(service, packet, self.secret)
+
+        validated = learnosity_sdk.request.ValidatedSecurity(
+            'items', json.dumps({'consumer_key': 'yis0TYCu7U9V4o7M', 'domain': 'localhost'}),
+            self.secret)
+        with patch.object(learnosity_sdk.request.Init, 'validate') as validate:
+            init = validated.init({})
+            self.assertEqual(0, validate.call_count)
+        self.assertIn('timestamp', init.security)
+        self.assertNotIn('timestamp', validated.security)
+
+    def test_generate_encoded(self) -> None:
+        """
+        Test that Init.generate() encodes the same data as generate(False)
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        for t in ServiceTests:
+            with self.subTest(repr(t), t=t):
+                init = learnosity_sdk.request.Init(
+                    t.service, self._prepare_security(t.security), self.secret,
+                    request=t.request, action=t.action)
+                output = init.generate(False)
+                if isinstance(output, str):
+                    output = json.loads(output)
+
+                encoded = init.generate()
+                if isinstance(encoded, dict):
+                    # The data service ignores encode
+                    encoded = json.dumps(encoded)
+
+                self.assertEqual(output, json.loads(encoded))
+                self.assertEqual(output, json.loads(init.generate_bytes()))
+
+    def test_generate_encoded_edge_cases(self) -> None:
+        """
+        Test that Init.generate() encodes requests that cannot be spliced
+        into the output, and keeps the output safe to embed in a script
+        """
+        learnosity_sdk.request.Init.disable_telemetry()
+        security = self._prepare_security({'user_id': 'user_1'})
+        requests = [
+            ('items', {'user_id': 'user_1', 'title': 'Line\u2028separator é'}),
+            ('questions', {'user_id': 'user_2', 'type': 'local_practice'}),
+            ('questions', {}),
+            ('events', None),
+        ]
+        for service, request in requests:
+            with self.subTest(service=service, request=request):
+                init = learnosity_sdk.request.Init(service, security, self.secret, request)
+                encoded = cast(str, init.generate())
+
+                self.assertEqual(init.generate(False), json.loads(encoded))
+                self.assertNotIn('\u2028', encoded)
+
+    def test_generate_stream(self) -> None:
+        """
+        Test that Init.generate_stream() writes the same output, with the
+        same signature, as Init.generate()
+        """
+        learnosity_sdk.request.Init.disable_telemetry()
+        for chunk_size in (16, 65536):
+            for t in ServiceTests:
+                if t.service == 'data':
+                    continue
+                with self.subTest(repr(t), t=t, chunk_size=chunk_size), \
+                        patch.object(learnosity_sdk.request.Init, 'stream_chunk_size', chunk_size):
+                    security = self._prepare_security(t.security)
+                    expected = learnosity_sdk.request.Init(
+                        t.service, security, self.secret, request=t.request,
+                        action=t.action).generate()
+
+                    chunks: List[str] = []
+                    streamed = learnosity_sdk.request.Init.generate_stream(
+                        chunks.append, t.service, security, self.secret,
+                        request=t.request, action=t.action)
+
+                    self.assertEqual(t.signature, streamed['signature'])
+                    self.assertEqual(json.loads(cast(str, expected)), json.loads(''.join(chunks)))
+
+    def test_generate_stream_data(self) -> None:
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            learnosity_sdk.request.Init.generate_stream(
+                print, 'data', self._prepare_security(), self.secret, {}, 'get')
+
+    def test_lazy(self) -> None:
+        """
+        Test that a lazy Init gives the same output as an eager one
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        for t in ServiceTests:
+            with self.subTest(repr(t), t=t):
+                security = self._prepare_security(t.security)
+                eager = learnosity_sdk.request.Init(
+                    t.service, security, self.secret, request=t.request, action=t.action)
+                lazy = learnosity_sdk.request.Init(
+                    t.service, security, self.secret, request=t.request, action=t.action,
+                    lazy=True)
+
+                self.assertEqual(eager.generate(), lazy.generate())
+                self.assertEqual(eager.request_string, lazy.request_string)
+                self.assertEqual(eager.security, lazy.security)
+
+    def test_lazy_defers_signing(self) -> None:
+        """
+        Test that a lazy Init only serialises and signs when used, and once
+        """
+        security = self._prepare_security()
+        with patch.object(learnosity_sdk.request.Init, 'generate_request_string',
+                          autospec=True, return_value='{}') as generate_request_string, \
+                patch.object(learnosity_sdk.request.Signer, 'hash_list',
+                             autospec=True, return_value='$02$signature') as hash_list:
+            init = learnosity_sdk.request.Init('items', security, self.secret, {}, lazy=True)
+            self.assertEqual(0, generate_request_string.call_count)
+            self.assertEqual(0, hash_list.call_count)
+
+            self.assertEqual('$02$signature', init.security['signature'])
+            init.generate()
+            self.assertEqual(1, generate_request_string.call_count)
+            self.assertEqual(1, hash_list.call_count)
+
+        with self.assertRaises(learnosity_sdk.exceptions.ValidationException):
+            learnosity_sdk.request.Init('invalid', security, self.secret, {}, lazy=True)
+
     def test_no_parameter_mangling(self) -> None:
         """ Test that Init.generate() does not modify its parameters """
         learnosity_sdk.request.Init.enable_telemetry()
@@ -144,6 +425,62 @@ class TestServiceRequests(unittest.TestCase):
                 self.assertEqual(security, security_copy, 'Original security modified by SDK')
                 self.assertEqual(t.request, request_copy, 'Original request modified by SDK')
 
+    def test_no_nested_parameter_mangling(self) -> None:
+        """
+        Test that Init does not modify nested parts of its request, and
+        shares rather than copies the parts it does not change
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        questions = [{'response_id': 'r1', 'type': 'mcq'}]
+        requests: List[Tuple[str, Dict[str, Any]]] = [
+            ('items', {'user_id': 'user_1', 'meta': {'trace': 'abc'}}),
+            ('assess', {
+                'meta': {'sdk': 'stale'},
+                'questionsApiActivity': {
+                    'consumer_key': 'stale', 'domain': 'localhost', 'signature': 'stale',
+                    'type': 'submit_practice', 'questions': questions,
+                },
+            }),
+        ]
+        for service, request in requests:
+            with self.subTest(service=service):
+                original = copy.deepcopy(request)
+                security = self._prepare_security({'user_id': 'user_1'})
+                init = learnosity_sdk.request.Init(service, security, self.secret, request)
+                init.generate()
+
+                self.assertEqual(original, request, 'Original request modified by SDK')
+                self.assertIn('sdk', cast(Dict[str, Any], init.request)['meta'])
+
+        activity = cast(Dict[str, Any], init.request)['questionsApiActivity']
+        self.assertIs(questions, activity['questions'])
+        self.assertNotEqual('stale', activity['signature'])
+        self.assertNotIn('domain', activity)
+
+    def test_telemetry_meta_cached(self) -> None:
+        """
+        Test that the telemetry meta is computed once, until telemetry is
+        toggled, and spliced into the request string correctly
+        """
+        learnosity_sdk.request.Init.enable_telemetry()
+        security = self._prepare_security()
+        requests: List[Dict[str, Any]] = [{}, {'user_id': 'user_1'}, {'meta': {'trace': 'é'}}]
+        with patch('platform.python_version', return_value='3.x') as python_version:
+            for _ in range(2):
+                for request in requests:
+                    with self.subTest(request=request):
+                        init = learnosity_sdk.request.Init('items', security, self.secret, request)
+                        self.assertEqual('3.x', cast(Dict[str, Any], init.request)['meta']['sdk']['lang_version'])
+                        self.assertEqual(
+                            json.dumps(init.request, separators=(',', ':'), ensure_ascii=False),
+                            init.request_string)
+            self.assertEqual(1, python_version.call_count)
+
+            learnosity_sdk.request.Init.disable_telemetry()
+            learnosity_sdk.request.Init.enable_telemetry()
+            learnosity_sdk.request.Init('items', security, self.secret, {})
+            self.assertEqual(2, python_version.call_count)
+
     def _prepare_security(self, add_security: Optional[Dict[str, str]]=None) -> Dict[str, str]:
         # TODO(cera): Much more validation
         security = {
@@ -154,3 +491,179 @@ class TestServiceRequests(unittest.TestCase):
         if add_security is not None:
             security.update(add_security)
         return security
+
+
+class TestSignatureCache(unittest.TestCase):
+    """
+    Tests for the opt-in signature cache
+    """
+
+    secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+    security = {
+        'consumer_key': 'yis0TYCu7U9V4o7M',
+        'domain': 'localhost',
+        'timestamp': '20140626-0528',
+    }
+
+    def setUp(self) -> None:
+        self.now = 1403760480.0
+        self.template = learnosity_sdk.request.RequestTemplate({
+            'activity_id': 'exam',
+            'user_id': learnosity_sdk.request.Placeholder('user_id'),
+            'items': ['item_1', 'item_2'],
+        })
+        learnosity_sdk.request.Init.disable_telemetry()
+        learnosity_sdk.request.Init.enable_signature_cache(maxsize=2, clock=lambda: self.now)
+
+    def tearDown(self) -> None:
+        learnosity_sdk.request.Init.disable_signature_cache()
+        learnosity_sdk.request.Init.enable_telemetry()
+
+    def _sign(self, user_id: Any, security: Optional[Dict[str, str]] = None,
+              secret: Optional[str] = None) -> str:
+        init = learnosity_sdk.request.Init(
+            'items', security or self.security, secret or self.secret,
+            self.template.render(user_id=user_id))
+        return cast(str, init.security['signature'])
+
+    def test_signatures(self) -> None:
+        for _ in range(2):
+            for t in ServiceTests:
+                with self.subTest(repr(t), t=t):
+                    security = TestServiceRequests()._prepare_security(t.security)
+                    init = learnosity_sdk.request.Init(
+                        t.service, security, self.secret, request=t.request, action=t.action)
+                    self.assertEqual(t.signature, init.security['signature'])
+
+    def test_hits(self) -> None:
+        with patch.object(learnosity_sdk.request.Signer, 'hash_list',
+                          autospec=True, return_value='$02$signature') as hash_list:
+            self._sign('user_1')
+            self._sign('user_1')
+            self.assertEqual(1, hash_list.call_count)
+
+            self._sign('user_2')
+            self._sign('user_3')
+            # Evicted as least recently used
+            self._sign('user_1')
+            self.assertEqual(4, hash_list.call_count)
+
+    def test_hit_not_serialised(self) -> None:
+        self._sign('user_1')
+        with patch.object(learnosity_sdk.request.RequestTemplate, 'serialise',
+                          autospec=True) as serialise:
+            init = learnosity_sdk.request.Init(
+                'items', self.security, self.secret,
+                self.template.render(user_id='user_1'), lazy=True)
+            init.security
+            serialise.assert_not_called()
+
+    def test_uncached_requests(self) -> None:
+        # Plain dicts, and templates with non-scalar values, would have to be
+        # serialised to be looked up
+        with patch.object(learnosity_sdk.request.Signer, 'hash_list',
+                          autospec=True, return_value='$02$signature') as hash_list:
+            for _ in range(2):
+                learnosity_sdk.request.Init(
+                    'items', self.security, self.secret, {'user_id': 'user_1'}).security
+                self._sign(['user_1'])
+            self.assertEqual(4, hash_list.call_count)
+
+            # The request of a Questions API packet is not signed
+            security = dict(self.security, user_id='user_1')
+            for _ in range(2):
+                learnosity_sdk.request.Init(
+                    'questions', security, self.secret, {'type': 'local_practice'}).security
+            self.assertEqual(5, hash_list.call_count)
+
+    def test_keys(self) -> None:
+        signature = self._sign('user_1')
+        self.assertNotEqual(signature, self._sign('user_1', secret='other secret'))
+        # Equal, but serialised differently
+        security = dict(self.security, user_id='user_1')
+        self.assertNotEqual(self._sign(1, security), self._sign(True, security))
+        self.assertEqual(self._sign('user_1'), signature)
+
+        learnosity_sdk.request.Init.enable_telemetry()
+        init = learnosity_sdk.request.Init(
+            'items', self.security, self.secret, self.template.render(user_id='user_1'))
+        self.assertEqual(init.hash_list(
+            [self.security['consumer_key'], self.security['domain'],
+             self.security['timestamp'], 'user_1', cast(str, init.request_string)]),
+            init.security['signature'])
+
+        cache = learnosity_sdk.request.Init._Init__signature_cache  # type: ignore[attr-defined]
+        for key in cache._entries:
+            # A digest, holding neither the secret nor the request
+            self.assertIsInstance(key, bytes)
+            self.assertEqual(32, len(key))
+
+    def test_expiry(self) -> None:
+        security = dict(self.security, expires='20140626-0530')
+        with patch.object(learnosity_sdk.request.Signer, 'hash_list',
+                          autospec=True, return_value='$02$signature') as hash_list:
+            self._sign('user_1', security)
+            self.now += 30
+            self._sign('user_1', security)
+            self.assertEqual(1, hash_list.call_count)
+
+            # The minute rolls over
+            self.now += 60
+            self._sign('user_1', security)
+            self.assertEqual(2, hash_list.call_count)
+
+            # The expiry time passes
+            self.now += 60
+            self._sign('user_1', security)
+            self._sign('user_1', security)
+            self.assertEqual(4, hash_list.call_count)
+
+
+class TestUserHashCache(unittest.TestCase):
+    """
+    Tests for hashing Events API users with a UserHashCache
+    """
+
+    secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+
+    def tearDown(self) -> None:
+        learnosity_sdk.request.Init.disable_user_hash_cache()
+
+    def _users(self, request: Dict[str, Any]) -> Dict[str, str]:
+        security = TestServiceRequests()._prepare_security()
+        init = learnosity_sdk.request.Init('events', security, self.secret, request)
+        return cast(Dict[str, str], init.security['users'])
+
+    def test_events(self) -> None:
+        users = ['user_{}'.format(i) for i in range(50)] + ['user_3', 'ユーザー']
+        expected = self._users({'users': users})
+
+        for executor in (None, ThreadPoolExecutor(max_workers=2)):
+            with self.subTest(executor=executor):
+                learnosity_sdk.request.Init.enable_user_hash_cache(
+                    maxsize=20, executor=executor, batch_size=8)
+                for _ in range(2):
+                    actual = self._users({'users': users})
+                    self.assertEqual(list(expected.items()), list(actual.items()))
+
+        spec = [t for t in ServiceTests if t.service == 'events'][0]
+        init = learnosity_sdk.request.Init(
+            'events', TestServiceRequests()._prepare_security(), self.secret, spec.request)
+        self.assertEqual(spec.signature, init.security['signature'])
+
+    def test_cache(self) -> None:
+        cache = learnosity_sdk.request.UserHashCache(maxsize=2)
+        with patch('learnosity_sdk.request.signer.hash_users',
+                   side_effect=lambda users, secret: [u + secret for u in users]) as hash_users:
+            self.assertEqual({'a': 'as1', 'b': 'bs1'}, cache.hash_users(['a', 'b'], 's1'))
+            self.assertEqual({'b': 'bs1', 'a': 'as1'}, cache.hash_users(['b', 'a'], 's1'))
+            self.assertEqual(1, hash_users.call_count)
+
+            # Cached per secret
+            self.assertEqual({'a': 'as2'}, cache.hash_users(['a'], 's2'))
+            self.assertEqual(2, hash_users.call_count)
+
+            # Least recently used first out
+            cache.hash_users(['a'], 's1')
+            cache.hash_users(['b'], 's1')
+            self.assertEqual(3, hash_users.call_count)
@@ -0,0 +1,113 @@
+from typing import Any, List
+import json
+import random
+import struct
+import unittest
+
+import learnosity_sdk.request
+from learnosity_sdk.utils.jsoncodec import (
+    HAS_ORJSON, JsonCodec, OrjsonCodec, get_codec, set_codec)
+from tests.unit import test_init
+
+
+def codecs() -> List[JsonCodec]:
+    available = [JsonCodec()]
+    if HAS_ORJSON:
+        available.append(OrjsonCodec())
+    return available
+
+
+def canonical(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class TestJsonCodecConformance(unittest.TestCase):
+    """
+    Tests to ensure that every codec encodes exactly as the standard library
+    does, so that signatures do not depend on the codec
+    """
+
+    values: List[Any] = [
+        None, True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 64, -2 ** 80,
+        '', 'plain', 'Évaluation', 'ユーザー', '😀', '"quoted" \\ slash',
+        '\x00\x08\x0c\n\r\t\x1f\x7f', '  ', '</script>', '\ud800',
+        [], {}, [1, [2, [3]]], (1, 2), {'b': 1, 'a': 2, 'c': {'z': [], 'y': {}}},
+        {1: 'int key'}, {True: 'bool key'}, {None: 'null key'}, {1.5: 'float key'},
+        {'null': None, 'value': 'null'}, ['1e16', '1.5'],
+        float('nan'), float('inf'), float('-inf'), {'score': float('nan')},
+    ]
+
+    floats = [
+        0.0, -0.0, 0.1, 0.5, 1.0, -1.5, 1e15, 1e16, 1e-4, 1e-5, 1e22, 1.5e300,
+        -2.5e-7, 5e-324, 1.7976931348623157e308, 123456789012345678.0,
+    ]
+
+    def test_values(self) -> None:
+        for codec in codecs():
+            for value in self.values:
+                with self.subTest(codec=codec.name, value=value):
+                    self.assertEqual(canonical(value), codec.dumps(value))
+
+    def test_floats(self) -> None:
+        rng = random.Random(0)
+        floats = list(self.floats)
+        while len(floats) < 5000:
+            value = struct.unpack('<d', struct.pack('<Q', rng.getrandbits(64)))[0]
+            if value == value and abs(value) != float('inf'):
+                floats.append(value)
+
+        for codec in codecs():
+            with self.subTest(codec=codec.name):
+                for value in floats:
+                    self.assertEqual(canonical(value), codec.dumps(value))
+                self.assertEqual(canonical(floats), codec.dumps(floats))
+                nested = {'f': floats[:50], 's': ['1.5e3', 'a"1e5"'], 'n': 10}
+                self.assertEqual(canonical(nested), codec.dumps(nested))
+
+    def test_rejects(self) -> None:
+        for codec in codecs():
+            with self.subTest(codec=codec.name):
+                with self.assertRaises(TypeError):
+                    codec.dumps({'set': {1, 2}})
+
+    def test_loads(self) -> None:
+        documents = [
+            '{"meta":{"status":true,"next":"abc"},"data":[{"id":"é"}]}',
+            '[1, 2.5, -0.0, 1e16, "x", null]', 'NaN', '{"a":1,"a":2}',
+            # Integers beyond 64 bits stay exact
+            '[123456789012345678901234567890, 18446744073709551616, -9223372036854775809]',
+            '{"max":18446744073709551615,"min":-9223372036854775808,"id":"1234567890123456789012"}',
+        ]
+        for codec in codecs():
+            for document in documents:
+                with self.subTest(codec=codec.name, document=document):
+                    expected = json.loads(document)
+                    self.assertEqual(repr(expected), repr(codec.loads(document)))
+                    self.assertEqual(repr(expected),
+                                     repr(codec.loads(document.encode('utf-8'))))
+
+
+class TestJsonCodecSignatures(unittest.TestCase):
+    """
+    Tests to ensure that Init signs identically with every codec
+    """
+
+    def tearDown(self) -> None:
+        set_codec(None)
+        learnosity_sdk.request.Init.enable_telemetry()
+
+    def test_default_codec(self) -> None:
+        set_codec(None)
+        self.assertEqual('orjson' if HAS_ORJSON else 'json', get_codec().name)
+
+    def test_signatures(self) -> None:
+        learnosity_sdk.request.Init.disable_telemetry()
+        helper = test_init.TestServiceRequests()
+        for codec in codecs():
+            set_codec(codec)
+            for t in test_init.ServiceTests:
+                with self.subTest(codec=codec.name, service=t.service):
+                    init = learnosity_sdk.request.Init(
+                        t.service, helper._prepare_security(t.security),
+                        helper.secret, request=t.request, action=t.action)
+                    self.assertEqual(t.signature, init.generate_signature())
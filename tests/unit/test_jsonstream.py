@@ -0,0 +1,69 @@
+import json
+from typing import Any, Dict, List
+import unittest
+from learnosity_sdk.utils.jsonstream import PageParser
+
+
+class TestPageParser(unittest.TestCase):
+    """
+    Tests for incrementally parsing Data API pages
+    """
+
+    pages: List[Dict[str, Any]] = [
+        {
+            'meta': {'status': True, 'next': 'abc', 'records': 6},
+            'data': [{'id': 'a"b\\', 'x': [1, {'y': '}]'}]}, 2, 'str', None, True, -1.5e3],
+        },
+        {
+            'meta': {'status': True},
+            'data': {'k1': {'v': 'é漢字😀'}, 'k2': [1], 'k3': 'str'},
+        },
+        {'data': [], 'meta': {'status': False}},
+        {'meta': {'status': True}, 'data': None},
+    ]
+
+    def _parse(self, body: bytes, chunk_size: int) -> List[Any]:
+        parser = PageParser()
+        results = []
+        for i in range(0, len(body), chunk_size):
+            results += parser.feed(body[i:i + chunk_size])
+        results += parser.close()
+        self.assertEqual(parser.count, len(results))
+        self._parser = parser
+        return results
+
+    def test_chunk_boundaries(self) -> None:
+        for page in self.pages:
+            for indent in (None, 2):
+                body = json.dumps(page, indent=indent, ensure_ascii=False).encode('utf-8')
+                data = page['data']
+                if isinstance(data, dict):
+                    expected = [{k: v} for k, v in data.items()]
+                else:
+                    expected = data or []
+                for chunk_size in (1, 2, 3, 5, 8, len(body)):
+                    with self.subTest(page=page, indent=indent, chunk_size=chunk_size):
+                        self.assertEqual(self._parse(body, chunk_size), expected)
+                        self.assertEqual(self._parser.meta, page['meta'])
+
+    def test_results_available_before_end(self) -> None:
+        parser = PageParser()
+        assert parser.feed(b'{"meta": {"status": true}, "data": [{"a": 1}, {"b"') == [{'a': 1}]
+        assert parser.meta == {'status': True}
+        assert parser.feed(b': 2}]}') == [{'b': 2}]
+        assert parser.close() == []
+
+    def test_buffer_bounded_by_element(self) -> None:
+        parser = PageParser()
+        parser.feed(b'{"data": [')
+        for i in range(1000):
+            parser.feed(json.dumps({'id': i}).encode('utf-8') + b',')
+        assert len(parser._buf) < 20
+
+    def test_invalid_documents(self) -> None:
+        for body in [b'[1]', b'{"a" 1}', b'{"data": [1 2]}', b'{"data": [1,', b'{"data": [tru]}']:
+            with self.subTest(body=body):
+                with self.assertRaises(ValueError):
+                    parser = PageParser()
+                    parser.feed(body)
+                    parser.close()
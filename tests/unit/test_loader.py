@@ -0,0 +1,117 @@
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+import unittest
+from urllib.parse import parse_qs
+import responses
+from learnosity_sdk.request import DataApi, DataLoader
+from learnosity_sdk.exceptions import DataApiException
+
+
+class UnitTestDataLoader(unittest.TestCase):
+    """
+    Tests to ensure that individual lookups are batched into single requests.
+    """
+
+    endpoint = 'https://data.learnosity.com/v1/itembank/items'
+    security = {'consumer_key': 'key', 'domain': 'localhost'}
+    secret = 'secret'
+
+    def setUp(self) -> None:
+        self.requested: List[List[str]] = []
+
+    def _callback(self, request: Any) -> Tuple[int, Dict[str, str], str]:
+        """Return an item for each reference, except missing ones"""
+        references = json.loads(parse_qs(request.body)['request'][0])['references']
+        self.requested.append(references)
+        return (200, {}, json.dumps({
+            'meta': {'status': True},
+            'data': [{'reference': r, 'title': r.upper()}
+                     for r in references if r != 'missing'],
+        }))
+
+    def _loader(self, **kwargs: Any) -> DataLoader:
+        return DataLoader(DataApi(), self.endpoint, self.security, self.secret, **kwargs)
+
+    @responses.activate
+    def test_loads_batched(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        with self._loader(window=0.05) as loader:
+            futures = loader.load_many(['a', 'b', 'a', 'missing'])
+            results = [f.result(timeout=5) for f in futures]
+
+        assert [r and r['title'] for r in results] == ['A', 'B', 'A', None]
+        assert self.requested == [['a', 'b', 'missing']]
+
+    @responses.activate
+    def test_loads_from_threads_batched(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        results: Dict[str, Any] = {}
+        with self._loader(window=0.1) as loader:
+            def run(reference: str) -> None:
+                results[reference] = loader.load(reference).result(timeout=5)
+
+            threads = [threading.Thread(target=run, args=(r,)) for r in 'abcde']
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(results) == list('abcde')
+        assert len(self.requested) == 1
+
+    @responses.activate
+    def test_max_batch_size(self) -> None:
+        responses.add_callback(responses.POST, self.endpoint, callback=self._callback)
+        with self._loader(max_batch_size=2, window=10) as loader:
+            futures = loader.load_many('abcde')
+            assert [f.result(timeout=5)['reference'] for f in futures[:4]] == list('abcd')
+
+        assert futures[4].result(timeout=5)['reference'] == 'e'
+        assert sorted(self.requested) == [['a', 'b'], ['c', 'd'], ['e']]
+
+    @responses.activate
+    def test_errors_propagated(self) -> None:
+        responses.add(responses.POST, self.endpoint, json={}, status=500)
+        with self._loader() as loader:
+            future = loader.load('a')
+            with self.assertRaises(DataApiException):
+                future.result(timeout=5)
+
+    def test_defaults_from_endpoint(self) -> None:
+        loader = DataLoader(DataApi(), 'https://data.learnosity.com/v1/sessions/responses',
+                            self.security, self.secret)
+        assert loader.key == 'session_id'
+        assert loader.id_field == 'session_id'
+        loader.close()
+
+    @responses.activate
+    def test_loads_keyed_data(self) -> None:
+        endpoint = 'https://data.learnosity.com/v1/itembank/questions'
+
+        def callback(request: Any) -> Tuple[int, Dict[str, str], str]:
+            references = json.loads(parse_qs(request.body)['request'][0])['item_references']
+            return (200, {}, json.dumps({
+                'meta': {'status': True},
+                'data': {r: [{'reference': r + '_q1'}] for r in references if r != 'missing'},
+            }))
+
+        responses.add_callback(responses.POST, endpoint, callback=callback)
+        with DataLoader(DataApi(), endpoint, self.security, self.secret) as loader:
+            futures = loader.load_many(['a', 'missing'])
+            results = [f.result(timeout=5) for f in futures]
+
+        assert results == [[{'reference': 'a_q1'}], None]
+
+    def test_load_after_close(self) -> None:
+        loader = self._loader()
+        loader.close()
+        with self.assertRaises(RuntimeError):
+            loader.load('a')
+
+        # A batch that can no longer be sent fails, rather than never resolving
+        future: 'Future[Any]' = Future()
+        loader._submit({'a': [future]})
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=5)
@@ -0,0 +1,69 @@
+import threading
+from typing import Iterator, List, Tuple
+import unittest
+from learnosity_sdk.utils.prefetch import Prefetcher
+
+
+class TestPrefetcher(unittest.TestCase):
+    """
+    Tests for the background prefetching iterator
+    """
+
+    def _source(self, sizes: List[int], fetched: List[int],
+                fail_at: int = -1) -> Iterator[Tuple[int, int]]:
+        for i, size in enumerate(sizes):
+            if i == fail_at:
+                raise RuntimeError('fetch failed')
+            fetched.append(i)
+            yield i, size
+
+    def _wait_for(self, fetched: List[int], count: int) -> None:
+        for _ in range(200):
+            if len(fetched) >= count:
+                return
+            threading.Event().wait(0.005)
+
+    def test_yields_in_order(self) -> None:
+        fetched: List[int] = []
+        with Prefetcher(self._source([1] * 5, fetched), depth=2) as prefetcher:
+            assert list(prefetcher) == [0, 1, 2, 3, 4]
+
+    def test_depth_bounds_fetching(self) -> None:
+        fetched: List[int] = []
+        with Prefetcher(self._source([1] * 10, fetched), depth=2) as prefetcher:
+            assert next(prefetcher) == 0
+            self._wait_for(fetched, 3)
+            threading.Event().wait(0.05)
+            # One value consumed, two buffered
+            assert len(fetched) == 3
+
+    def test_max_size_bounds_fetching(self) -> None:
+        fetched: List[int] = []
+        with Prefetcher(self._source([100] * 10, fetched), depth=5,
+                        max_size=150) as prefetcher:
+            assert next(prefetcher) == 0
+            self._wait_for(fetched, 3)
+            threading.Event().wait(0.05)
+            # The second buffered value would exceed max_size
+            assert len(fetched) == 3
+            assert list(prefetcher) == list(range(1, 10))
+
+    def test_error_raised_in_order(self) -> None:
+        fetched: List[int] = []
+        prefetcher = Prefetcher(self._source([1] * 5, fetched, fail_at=2), depth=3)
+        assert next(prefetcher) == 0
+        assert next(prefetcher) == 1
+        with self.assertRaisesRegex(RuntimeError, 'fetch failed'):
+            next(prefetcher)
+
+    def test_close_stops_fetching(self) -> None:
+        fetched: List[int] = []
+        prefetcher = Prefetcher(self._source([1] * 100, fetched), depth=1)
+        next(prefetcher)
+        prefetcher.close()
+        threading.Event().wait(0.05)
+        assert len(fetched) < 100
+
+    def test_invalid_depth(self) -> None:
+        with self.assertRaises(ValueError):
+            Prefetcher(iter([]), depth=0)
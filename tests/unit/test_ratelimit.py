@@ -0,0 +1,152 @@
+import io
+import threading
+from typing import List
+import unittest
+import responses
+from requests import Response
+from learnosity_sdk.request import DataApi, RateLimitController
+
+
+def _response(status: int, retry_after: str = '') -> Response:
+    res = Response()
+    res.status_code = status
+    res.raw = io.BytesIO(b'')
+    if retry_after:
+        res.headers['Retry-After'] = retry_after
+    return res
+
+
+class TestRateLimitController(unittest.TestCase):
+    """
+    Tests for retrying throttled requests and adapting concurrency
+    """
+
+    def setUp(self) -> None:
+        self.sleeps: List[float] = []
+        self.controller = RateLimitController(sleep=self.sleeps.append)
+
+    def test_retries_throttled_responses(self) -> None:
+        statuses = [429, 503, 200]
+        res = self.controller.call('key', lambda: _response(statuses.pop(0)))
+
+        assert res.status_code == 200
+        assert len(self.sleeps) == 2
+
+    def test_closes_throttled_responses(self) -> None:
+        throttled, ok = _response(429), _response(200)
+        sent = [throttled, ok]
+        res = self.controller.call('key', lambda: sent.pop(0))
+
+        assert res is ok
+        assert throttled.raw.closed
+        assert not ok.raw.closed
+
+    def test_gives_up_after_max_retries(self) -> None:
+        controller = RateLimitController(max_retries=2, sleep=self.sleeps.append)
+        res = controller.call('key', lambda: _response(429))
+
+        assert res.status_code == 429
+        assert len(self.sleeps) == 2
+
+    def test_does_not_retry_client_errors(self) -> None:
+        res = self.controller.call('key', lambda: _response(400))
+
+        assert res.status_code == 400
+        assert self.sleeps == []
+
+    def test_honours_retry_after_seconds(self) -> None:
+        statuses = [429, 200]
+        self.controller.call('key', lambda: _response(statuses.pop(0), '7'))
+        assert self.sleeps == [7.0]
+
+    def test_retry_after_not_capped(self) -> None:
+        controller = RateLimitController(backoff_max=60)
+        assert controller.retry_delay(_response(429, '120'), 0) == 120.0
+
+    def test_honours_retry_after_date(self) -> None:
+        delay = self.controller.retry_delay(
+            _response(429, 'Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+        assert delay == 0.0
+
+    def test_backoff_with_jitter(self) -> None:
+        controller = RateLimitController(backoff_base=1, backoff_max=5)
+        for attempt in range(6):
+            delay = controller.retry_delay(_response(503), attempt)
+            assert 0 <= delay <= min(5, 2 ** attempt)
+
+    def test_aimd_limit(self) -> None:
+        controller = RateLimitController(initial_limit=4, max_limit=8,
+                                         sleep=self.sleeps.append)
+        for _ in range(4):
+            controller.call('key', lambda: _response(200))
+        assert 4.9 < controller.limit('key') < 5
+
+        statuses = [429, 200]
+        controller.call('key', lambda: _response(statuses.pop(0)))
+        assert controller.limit('key') < 3
+
+        # Limits are tracked per consumer key
+        assert controller.limit('other') == 4
+
+    def test_decreases_once_per_round_trip(self) -> None:
+        controller = RateLimitController(initial_limit=8, max_limit=8,
+                                         max_retries=0)
+        barrier = threading.Barrier(8)
+
+        def send() -> Response:
+            # All in flight before any is throttled
+            barrier.wait()
+            return _response(429)
+
+        threads = [threading.Thread(target=controller.call, args=('key', send))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert controller.limit('key') == 4
+
+        # A request sent after the decrease can decrease it again
+        controller.call('key', lambda: _response(429))
+        assert controller.limit('key') == 2
+
+    def test_limits_requests_in_flight(self) -> None:
+        controller = RateLimitController(initial_limit=2, max_limit=2)
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def send() -> Response:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            threading.Event().wait(0.005)
+            with lock:
+                in_flight[0] -= 1
+            return _response(200)
+
+        threads = [threading.Thread(target=controller.call, args=('key', send))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert in_flight[1] == 2
+
+    def test_invalid_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            RateLimitController(initial_limit=0)
+
+    @responses.activate
+    def test_request_iter_retries_throttled_page(self) -> None:
+        endpoint = 'https://data.learnosity.com/v1/itembank/items'
+        responses.add(responses.POST, endpoint, json={}, status=429)
+        responses.add(responses.POST, endpoint,
+                      json={'meta': {'status': True}, 'data': [{'id': 'a'}]})
+        client = DataApi(rate_limiter=self.controller)
+        results = list(client.results_iter(
+            endpoint, {'consumer_key': 'key', 'domain': 'localhost'}, 'secret'))
+
+        assert results == [{'id': 'a'}]
+        assert len(responses.calls) == 2
+        assert len(self.sleeps) == 1
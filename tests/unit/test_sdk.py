@@ -1,5 +1,7 @@
 import collections
-from typing import Any, Dict
+import subprocess
+import sys
+from typing import Any, Dict, List
 import unittest
 
 SdkTestSpec = collections.namedtuple(
@@ -33,6 +35,12 @@ SdkModuleTests = [
     SdkTestSpec(
         "from learnosity_sdk.request import *", "DataApi"
     ),
+    SdkTestSpec(
+        "from learnosity_sdk.request import *", "AsyncDataApi"
+    ),
+    SdkTestSpec(
+        "from learnosity_sdk.request import *", "BulkWriter"
+    ),
 ]
 
 def _run_test(t: Any) -> None:
@@ -58,3 +66,37 @@ class TestSdkModuleImport(unittest.TestCase):
     def test_sdk_imports(self) -> None:
         for t in SdkModuleTests:
             _run_test(t)
+
+class TestSdkImportTime(unittest.TestCase):
+    """
+    Tests that signing requests does not import the HTTP stack
+    """
+
+    script = (
+        "import learnosity_sdk\n"
+        "learnosity_sdk.request.Init('items', {'consumer_key': 'key', 'domain': 'localhost'},"
+        " 'secret', {}).generate()\n"
+    )
+
+    # Only needed by the Data API, or by Init.generate_many with processes
+    heavy = ['requests', 'urllib3', 'asyncio', 'multiprocessing', 'sqlite3']
+
+    def _imported(self, script: str) -> List[str]:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            capture_output=True, text=True, check=True)
+        # Lines are "import time: self | cumulative | name", nested by indent
+        return [
+            line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines()
+            if line.startswith('import time:') and line.count('|') == 2]
+
+    def test_init_does_not_import_dataapi(self) -> None:
+        imported = self._imported(self.script)
+        self.assertIn('learnosity_sdk.request.init', imported)
+        for module in self.heavy:
+            self.assertNotIn(module, imported)
+
+    def test_dataapi_imported_on_first_use(self) -> None:
+        imported = self._imported(self.script + "learnosity_sdk.request.DataApi\n")
+        self.assertIn('requests', imported)
+        self.assertIn('urllib3', imported)
@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Dict, List
+import unittest
+from unittest.mock import patch
+import responses
+from learnosity_sdk.request import DataApi
+from learnosity_sdk.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Tests for coalescing concurrent identical calls
+    """
+
+    def _run_concurrently(self, flight: 'SingleFlight[int]', key: str,
+                          func: Any, callers: int) -> List[Any]:
+        results: List[Any] = [None] * callers
+        release = threading.Event()
+
+        def blocking() -> int:
+            release.wait()
+            return int(func())
+
+        def run(i: int) -> None:
+            try:
+                results[i] = flight.do(key, blocking)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        for _ in range(200):
+            if flight.in_flight(key) == callers:
+                break
+            threading.Event().wait(0.005)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_result(self) -> None:
+        calls: List[int] = []
+
+        def call() -> int:
+            calls.append(1)
+            return 42
+
+        flight: SingleFlight[int] = SingleFlight()
+        results = self._run_concurrently(flight, 'a', call, 5)
+
+        assert results == [42] * 5
+        assert len(calls) == 1
+        assert flight.in_flight('a') == 0
+
+    def test_concurrent_calls_share_error(self) -> None:
+        def fail() -> int:
+            raise RuntimeError('failed')
+
+        flight: SingleFlight[int] = SingleFlight()
+        results = self._run_concurrently(flight, 'a', fail, 3)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_sequential_calls_not_shared(self) -> None:
+        calls: List[int] = []
+
+        def call() -> int:
+            calls.append(1)
+            return len(calls)
+
+        flight: SingleFlight[int] = SingleFlight()
+        assert flight.do('a', call) == 1
+        assert flight.do('a', call) == 2
+
+
+class TestDataApiCoalescing(unittest.TestCase):
+    """
+    Tests for sharing concurrent identical Data API requests
+    """
+
+    endpoint = 'https://data.learnosity.com/v1/itembank/items'
+    security = {'consumer_key': 'key', 'domain': 'localhost'}
+    page: Dict[str, Any] = {'meta': {'status': True}, 'data': [{'reference': 'item_1'}]}
+
+    @responses.activate
+    def test_concurrent_results_iter_coalesced(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(coalesce=True)
+        release = threading.Event()
+        send = client._send
+
+        def slow_send(*args: Any) -> Any:
+            release.wait()
+            return send(*args)
+
+        results: List[List[Dict[str, Any]]] = []
+
+        def run() -> None:
+            results.append(list(client.results_iter(
+                self.endpoint, self.security, 'secret', {'references': ['item_1']})))
+
+        with patch.object(client, '_send', side_effect=slow_send):
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            threading.Event().wait(0.05)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert len(responses.calls) == 1
+        assert results == [self.page['data']] * 4
+        # Each caller has its own copy of the page
+        assert results[0][0] is not results[1][0]
+
+    @responses.activate
+    def test_writes_not_coalesced(self) -> None:
+        responses.add(responses.POST, self.endpoint, json=self.page)
+        client = DataApi(coalesce=True)
+        assert not client._is_read_only('set')
+        assert client._is_read_only('get')
@@ -0,0 +1,134 @@
+from typing import Any, Dict, cast
+import unittest
+
+from learnosity_sdk.exceptions import ValidationException
+from learnosity_sdk.request import (
+    ActivityTemplate, Init, Placeholder, PreparedRequest, RequestTemplate, Signer)
+
+
+class TestRequestTemplate(unittest.TestCase):
+    """
+    Tests to ensure that templated requests are signed like plain requests
+    """
+
+    secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+    security = {
+        'consumer_key': 'yis0TYCu7U9V4o7M',
+        'domain': 'localhost',
+        'timestamp': '20140626-0528',
+    }
+
+    def tearDown(self) -> None:
+        Init.enable_telemetry()
+
+    def _request(self, user_id: Any, session_id: Any) -> Dict[str, Any]:
+        return {
+            'activity_id': 'exam',
+            'user_id': user_id,
+            'session_id': session_id,
+            'items': ['item_1', 'item_2'],
+            'config': {
+                'title': 'Évaluation',
+                'regions': [{'name': 'main', 'owner': user_id}],
+                'weight': 0.5,
+            },
+        }
+
+    def _assert_same(self, template: RequestTemplate, request: Dict[str, Any],
+                     **values: Any) -> None:
+        rendered = template.render(**values)
+        self.assertIsInstance(rendered, PreparedRequest)
+
+        expected = Init('items', self.security, self.secret, request)
+        actual = Init('items', self.security, self.secret, rendered)
+
+        self.assertEqual(expected.request_string, actual.request_string)
+        self.assertEqual(expected.generate(), actual.generate())
+
+    def test_render(self) -> None:
+        template = RequestTemplate(
+            self._request(Placeholder('user_id'), Placeholder('session_id')))
+
+        for telemetry in (True, False):
+            with self.subTest(telemetry=telemetry):
+                if telemetry:
+                    Init.enable_telemetry()
+                else:
+                    Init.disable_telemetry()
+                for user_id, session_id in (('user_1', 'session'),
+                                            ('ユーザー "2"', 42),
+                                            ('user_3', None)):
+                    self._assert_same(template, self._request(user_id, session_id),
+                                      user_id=user_id, session_id=session_id)
+
+    def test_render_with_meta(self) -> None:
+        request = self._request(Placeholder('user_id'), 'session')
+        request['meta'] = {'sdk': 'stale', 'trace': Placeholder('trace')}
+        template = RequestTemplate(request)
+
+        expected = self._request('user_1', 'session')
+        expected['meta'] = {'sdk': 'stale', 'trace': 'abc'}
+        self._assert_same(template, expected, user_id='user_1', trace='abc')
+
+        # The template itself is never modified
+        self.assertEqual('stale', request['meta']['sdk'])
+
+    def test_render_shares_invariant_parts(self) -> None:
+        template = RequestTemplate(self._request(Placeholder('user_id'), 'session'))
+        first = template.render(user_id='user_1')
+        second = template.render(user_id='user_2')
+
+        self.assertIs(first['items'], second['items'])
+        self.assertIsNot(first['config'], second['config'])
+        self.assertEqual('user_2', second['config']['regions'][0]['owner'])
+
+    def test_render_missing_value(self) -> None:
+        template = RequestTemplate(
+            self._request(Placeholder('user_id'), Placeholder('session_id')))
+
+        with self.assertRaises(ValidationException):
+            template.render(user_id='user_1')
+
+
+class TestActivityTemplate(unittest.TestCase):
+    """
+    Tests to ensure that assess activities prepared once are signed like
+    plain activities
+    """
+
+    secret = '74c5fd430cf1242a527f6223aebd42d30464be22'
+
+    def test_sign(self) -> None:
+        questions = [{'response_id': 'r{}'.format(i), 'type': 'mcq'} for i in range(3)]
+        activity = {
+            'consumer_key': 'stale', 'signature': 'stale', 'type': 'submit_practice',
+            'state': 'initial', 'questions': questions,
+        }
+        template = ActivityTemplate(activity)
+
+        for domain in ('localhost', None):
+            for timestamp in ('20140626-0528', '20140626-0529'):
+                for user_id in ('user_1', 'user_2'):
+                    with self.subTest(domain=domain, timestamp=timestamp, user_id=user_id):
+                        security = {
+                            'consumer_key': 'yis0TYCu7U9V4o7M',
+                            'timestamp': timestamp,
+                            'user_id': user_id,
+                        }
+                        if domain is not None:
+                            security['domain'] = domain
+
+                        expected = Init('assess', security, self.secret,
+                                        {'questionsApiActivity': activity})
+                        actual = Init('assess', security, self.secret,
+                                      {'questionsApiActivity': template})
+
+                        self.assertEqual(expected.generate(), actual.generate())
+                        signed = cast(Dict[str, Any], actual.request)['questionsApiActivity']
+                        self.assertIs(questions, signed['questions'])
+
+    def test_with_prefix(self) -> None:
+        signer = Signer(self.secret)
+        prefixed = signer.with_prefix(['a', 'b'])
+        self.assertEqual(signer.hash_list(['a', 'b', 'c', 'd']), prefixed.hash_list(['c', 'd']))
+        self.assertEqual(signer.hash_list(['a', 'b', 'e']), prefixed.hash_list(['e']))